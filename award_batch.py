@@ -0,0 +1,144 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Iterator, Optional
+
+from awards.configs import BaseDetails
+from awards.extraction_cache import ExtractionCache
+from awards.logger import Logger
+from awards.utils import IDManager
+
+logger = Logger()
+
+
+@dataclass
+class ExtractionResult:
+    source_path: Path
+    category: Optional[str] = None
+    log_id: Optional[str] = None
+    pdf_data: dict[str, Optional[str]] = field(default_factory=dict)
+    widget_count: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def apply_to(self, award: BaseDetails) -> BaseDetails:
+        """
+        Loads the extracted data into an `IndividualAward` / `GroupAward` instance.
+        """
+        if not self.ok:
+            raise ValueError(f"Cannot apply failed extraction: {self.error}")
+        award.load_pdf_data(self.category, self.pdf_data, log_id=self.log_id)
+        return award
+
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    failed: int = 0
+    widgets: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def widgets_per_sec(self) -> float:
+        return self.widgets / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files} files ({self.failed} failed), {self.widgets} widgets in {self.elapsed:.2f} sec.  |  "
+            f"{self.files_per_sec:.1f} files/sec  |  {self.widgets_per_sec:.1f} widgets/sec"
+        )
+
+
+def iter_award_pdfs(source: Path | str | Iterable[Path | str]) -> list[Path]:
+    """
+    Resolves a directory or an iterable of paths to an ordered list of PDF paths.
+    Temporary files (prefixed with '$' or '~') are skipped.
+    """
+    if isinstance(source, (str, Path)):
+        source = Path(str(source).replace('"', "").strip())
+        if not source.is_dir():
+            raise ValueError(f"Directory not found or not a directory: {source}")
+        paths = sorted(source.glob("*.pdf"))
+    else:
+        paths = [Path(path) for path in source]
+    return [path for path in paths if not path.name.startswith(("$", "~"))]
+
+
+def _extract_one(
+    source_path: Path, cache: Optional[ExtractionCache] = None
+) -> ExtractionResult:
+    """
+    Worker entry point. Errors are captured on the result instead of raised.
+    """
+    result = ExtractionResult(source_path=source_path)
+    try:
+        result.category, result.pdf_data, result.widget_count = (
+            BaseDetails.read_pdf_fields(source_path, cache)
+        )
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def extract_batch(
+    source: Path | str | Iterable[Path | str],
+    max_workers: Optional[int] = None,
+    stats: Optional[BatchStats] = None,
+    cache: Optional[ExtractionCache] = None,
+    assign_log_ids: bool = True,
+) -> Iterator[ExtractionResult]:
+    """
+    Extracts award PDFs over a process pool and yields results in input order.
+
+    Workers may finish out of order, but results are yielded (and log IDs
+    assigned by `IDManager.get`) strictly in input order, so a re-run over the
+    same inbox assigns the same IDs. Failed files do not consume a log ID.
+    Read-only consumers (e.g. duplicate checks) pass `assign_log_ids=False`.
+    """
+    paths = iter_award_pdfs(source)
+    stats = stats if stats is not None else BatchStats()
+    if not paths:
+        logger.warning("No award PDFs found.")
+        return
+
+    timer_start = perf_counter()
+    chunksize = max(1, len(paths) // ((max_workers or 4) * 8))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            _extract_one, paths, [cache] * len(paths), chunksize=chunksize
+        )
+        for result in results:
+            stats.files += 1
+            stats.widgets += result.widget_count
+            if result.ok and assign_log_ids:
+                result.log_id = IDManager.get(result.category)
+            elif not result.ok:
+                stats.failed += 1
+                logger.warning(f"{result.source_path.name}: {result.error}")
+            stats.elapsed = perf_counter() - timer_start
+            yield result
+
+    logger.info(f"Batch extraction complete. {stats}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: award_batch.py <pdf_directory> [max_workers]")
+        sys.exit(1)
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    for result in extract_batch(sys.argv[1], max_workers=max_workers):
+        status = result.log_id if result.ok else f"ERROR: {result.error}"
+        print(f"{result.source_path.name}  |  {status}")
+
+
+if __name__ == "__main__":
+    main()
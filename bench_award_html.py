@@ -0,0 +1,85 @@
+"""
+Benchmark for award HTML parsing: text flattening vs. the table parser.
+
+Generates a synthetic award table dump, parses it with the text path
+(`clean_html_content` -> `extract_text_from_html` -> `parse_award_items`)
+and with `parse_award_file`, checks both return the same records, and
+reports timings. With --memory, each path is run again under tracemalloc
+to report peak memory (much slower).
+
+usage: python bench_award_html.py [row_count] [--memory]
+"""
+
+import random
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+import process_awards_html_data as awards_html
+
+BENCH_NOA_CODES: frozenset[str] = frozenset({"840", "841", "849", "878", "879"})
+
+
+def generate_dump(path: Path, row_count: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    codes = sorted(BENCH_NOA_CODES) + ["100", "702", "893"]
+    with path.open("w", encoding="utf-8") as f:
+        f.write("<table>\n")
+        for _ in range(row_count):
+            cells = [
+                f"{rng.choice(codes)} Award Action",
+                f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(2020, 2026)}",
+                f"EMP-{rng.randint(100000, 999999)}",
+                rng.choice(["Processed", "Pending"]),
+                rng.choice(["GS-12", "GS-13", "GS-14"]),
+                f"${rng.randint(1, 50) * 100:,}.00",
+            ]
+            f.write("<tr>\n" + "\n".join(f"<td>{cell}</td>" for cell in cells) + "\n</tr>\n")
+        f.write("</table>\n")
+
+
+def text_path(path: Path) -> list[tuple]:
+    html_content = awards_html.clean_html_content(path.read_text(encoding="utf-8"))
+    return awards_html.parse_award_items(awards_html.extract_text_from_html(html_content))
+
+
+def measure(label: str, func, trace_memory: bool = False) -> tuple[list, float]:
+    timer_start = perf_counter()
+    result = func()
+    elapsed = perf_counter() - timer_start
+    line = f"{label:<14}{elapsed:8.3f} sec.  {len(result)} records"
+    if trace_memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  peak {peak / 2**20:.1f} MiB"
+    print(line)
+    return result, elapsed
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    row_count = int(args[0]) if args else 200_000
+    trace_memory = "--memory" in sys.argv[1:]
+    awards_html.NOA_CODES = BENCH_NOA_CODES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dump_path = Path(tmp_dir) / "html_data_dump.html"
+        generate_dump(dump_path, row_count)
+        print(f"{row_count} rows, {dump_path.stat().st_size / 2**20:.1f} MiB")
+
+        expected, text_time = measure("text path", lambda: text_path(dump_path), trace_memory)
+        records, table_time = measure(
+            "table parser",
+            lambda: awards_html.parse_award_file(dump_path, BENCH_NOA_CODES),
+            trace_memory,
+        )
+        if [tuple(record) for record in records] != expected:
+            raise AssertionError("table parser output differs from the text path")
+        print(f"speedup: {text_time / table_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
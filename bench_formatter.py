@@ -0,0 +1,111 @@
+"""
+Micro-benchmark for Formatter.clean / Formatter.key / Formatter.pay_plan.
+
+Checks the current implementation is byte-identical to the original
+multi-pass version on a corpus of real field names plus generated values,
+then reports the per-call timings of both.
+
+usage: python bench_formatter.py [corpus_size]
+"""
+
+import json
+import random
+import re
+import sys
+from pathlib import Path
+from timeit import timeit
+
+from awards.formatting import Formatter
+
+
+def legacy_clean(text: str) -> str | None:
+    text = str(text).strip()
+    text = text.encode("ascii", errors="ignore").decode("ascii")
+    text = re.sub(r"[\r\t]+", lambda m: "\n" if m.group(0) == "\r" else " ", text)
+    text = re.sub(r"\n{2,}", "\n", text)
+    text = re.sub(r" {2,}", " ", text)
+    return text.strip() if text else None
+
+
+def legacy_key(text: str) -> str | None:
+    text = legacy_clean(text)
+    if not text:
+        return None
+
+    matches = re.findall(r"[a-zA-Z0-9]+", text)
+    return "_".join(matches).lower()
+
+
+def legacy_fmtpart(part: str) -> str | None:
+    part = re.sub(r"^[^a-zA-Z0-9]+|[^a-zA-Z0-9]+$", "", part)
+    part = re.sub(r"[^a-zA-Z0-9]+", "-", part).upper()
+    part = re.sub(r"-+", "-", part)
+    return part if part else None
+
+
+def legacy_pay_plan(text: str) -> str | None:
+    text = legacy_clean(text)
+    if not text:
+        return None
+
+    parts = [legacy_fmtpart(part) for part in text.split() if legacy_fmtpart(part)]
+    return "-".join(parts) if parts else None
+
+
+def load_field_names() -> list[str]:
+    def walk(node) -> list[str]:
+        if isinstance(node, dict):
+            return [name for child in node.values() for name in walk(child)]
+        if isinstance(node, list):
+            return [name for name in node if isinstance(name, str)]
+        return []
+
+    path = Path(__file__).with_name("pdf_field_name_data.json")
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as f:
+        return walk(json.load(f))
+
+
+def generate_values(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    alphabet = "abcXYZ019 .,-/'\"()\r\n\té’ "
+    values: list = [None, "", " ", "\r", "\t\t", "é \t", "GS-13 / 05", 1250, 3.5]
+    for _ in range(count):
+        length = rng.randint(0, 60)
+        values.append("".join(rng.choice(alphabet) for _ in range(length)))
+    return values
+
+
+def main():
+    corpus_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    field_names = load_field_names()
+    values = generate_values(corpus_size)
+    corpus = field_names + values
+
+    pairs = [
+        ("clean", Formatter.clean, legacy_clean, corpus),
+        ("key", Formatter.key, legacy_key, field_names * 20 + values),
+        ("pay_plan", Formatter.pay_plan, legacy_pay_plan, corpus),
+    ]
+    for name, current, legacy, inputs in pairs:
+        mismatches = [value for value in inputs if current(value) != legacy(value)]
+        if mismatches:
+            raise AssertionError(
+                f"{name}: {len(mismatches)} mismatches, first: {mismatches[0]!r}"
+            )
+
+        current_time = timeit(lambda: [current(value) for value in inputs], number=3)
+        legacy_time = timeit(lambda: [legacy(value) for value in inputs], number=3)
+        per_call = 1e6 / (3 * len(inputs))
+        print(
+            f"{name.ljust(10)}{len(inputs):>8} inputs  |  "
+            f"legacy {legacy_time * per_call:7.2f} us/call  |  "
+            f"current {current_time * per_call:7.2f} us/call  |  "
+            f"{legacy_time / current_time:5.2f}x"
+        )
+    print("\nAll outputs identical.")
+
+
+if __name__ == "__main__":
+    main()
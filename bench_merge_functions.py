@@ -0,0 +1,85 @@
+"""
+Benchmark for the `function` aggregation in merge_employee_functions.
+
+Builds synthetic rosters (several rows per employee, blank, padded and
+non-string functions mixed in), aggregates them with the original
+sort + groupby lambda and with `aggregate_functions`, checks the output is
+identical, and reports timings.
+
+usage: python bench_merge_functions.py [row_count ...]
+"""
+
+import random
+import sys
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from excel_processor import (
+    _join_functions,
+    aggregate_functions,
+    identifier_cols,
+    normalize_identifiers,
+)
+
+ROW_COUNTS: tuple[int, ...] = (10_000, 100_000, 1_000_000)
+
+
+def generate_roster(row_count: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    employees = rng.integers(0, max(row_count // 4, 1), row_count)
+    functions = np.array(
+        ["Budget review", " Payroll ", "", "   ", None, "Training", "Awards processing", 42],
+        dtype=object,
+    )
+    return pd.DataFrame(
+        {
+            "name": [f"Employee {i}" if i % 11 else f" Employee {i} " for i in employees],
+            "UUID": employees,
+            "position": rng.choice(["Analyst", "Specialist", "Manager"], row_count),
+            "company": "HQ",
+            "location": rng.choice(["Denver", "Boston ", None], row_count),
+            "function": functions[rng.integers(0, len(functions), row_count)],
+        }
+    )
+
+
+def lambda_path(df: pd.DataFrame) -> pd.DataFrame:
+    """The aggregation as merge_employee_functions originally ran it."""
+    df = df.copy()
+    df[identifier_cols] = df[identifier_cols].apply(lambda col: col.map(str).str.strip())
+    df.sort_values(by=identifier_cols, inplace=True)
+    return df.groupby(identifier_cols, as_index=False)["function"].agg(_join_functions)
+
+
+def vectorized_path(df: pd.DataFrame) -> pd.DataFrame:
+    return aggregate_functions(normalize_identifiers(df.copy()))
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or ROW_COUNTS
+    random.seed(0)
+    for row_count in row_counts:
+        df = generate_roster(row_count)
+
+        timer_start = perf_counter()
+        expected = lambda_path(df)
+        lambda_time = perf_counter() - timer_start
+
+        timer_start = perf_counter()
+        merged = vectorized_path(df)
+        vectorized_time = perf_counter() - timer_start
+
+        merged = merged.astype({col: object for col in identifier_cols})
+        if not merged.equals(expected.astype({col: object for col in identifier_cols})):
+            raise AssertionError(f"{row_count} rows: vectorized output differs")
+        print(
+            f"{row_count:>9,} rows  {len(merged):>8,} groups  "
+            f"lambda {lambda_time:7.3f} sec.  vectorized {vectorized_time:7.3f} sec.  "
+            f"({lambda_time / vectorized_time:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
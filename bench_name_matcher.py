@@ -0,0 +1,104 @@
+"""
+Boundary checks and benchmark for name_matcher.
+
+Checks that scores exactly at the threshold are accepted (the float
+threshold arithmetic used to reject them) and that typical typos,
+transpositions and "Last, First" reversals match, then reconciles a
+synthetic roster against a copy with typos and reports timings.
+
+usage: python bench_name_matcher.py [roster_size]
+"""
+
+import random
+import sys
+from time import perf_counter
+
+from name_matcher import DEFAULT_THRESHOLD, NameIndex, edit_distance, reconcile, similarity
+
+SYLLABLES: tuple[str, ...] = (
+    "an", "bel", "car", "dor", "el", "fin", "gar", "hal", "is", "jon",
+    "kel", "lar", "mar", "nor", "os", "per", "ros", "sam", "tor", "wil",
+)
+
+
+def check_boundaries() -> None:
+    # One edit in five characters is exactly 0.8; two in ten likewise.
+    cases = [
+        ("abcde", "abcdx", 0.8, 0.8),
+        ("abcdefghij", "abcdefghxy", 0.8, 0.8),
+        ("abcdefghij", "abcdefgxyz", 0.8, 0.0),
+        ("abcd", "abcx", 0.75, 0.75),
+        ("abc", "abc", 1.0, 1.0),
+        ("", "", 0.9, 1.0),
+    ]
+    for a, b, threshold, expected in cases:
+        score = similarity(a, b, threshold)
+        if abs(score - expected) > 1e-9:
+            raise AssertionError(f"similarity({a!r}, {b!r}, {threshold}) = {score}, expected {expected}")
+    if edit_distance("jonh", "john") != 1:
+        raise AssertionError("a transposition must cost one edit")
+
+    index = NameIndex(["Smith, John", "Mcdonald, John", "Lopez, Ana"])
+    for query, expected in [
+        ("Jonh Smith", "Smith, John"),
+        ("Smiht, John", "Smith, John"),
+        ("JOHN MCDONALD", "Mcdonald, John"),
+        ("Ana Lopes", "Lopez, Ana"),
+    ]:
+        match = index.best_match(query)
+        if match.match != expected:
+            raise AssertionError(f"{query!r} matched {match.match!r}, expected {expected!r}")
+
+
+def typo(rng: random.Random, word: str) -> str:
+    idx = rng.randrange(len(word))
+    roll = rng.random()
+    if roll < 0.33:
+        return word[:idx] + word[idx + 1 :]
+    if roll < 0.66:
+        return word[:idx] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[idx + 1 :]
+    return word[:idx] + word[idx : idx + 2][::-1] + word[idx + 2 :]
+
+
+def generate_names(roster_size: int, seed: int = 0) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+
+    def word(parts: int) -> str:
+        return "".join(rng.choice(SYLLABLES) for _ in range(parts)).capitalize()
+
+    people = [(word(2), word(rng.randint(2, 3))) for _ in range(roster_size)]
+    right = [f"{last}, {first}" for first, last in people]
+    left = []
+    for first, last in people:
+        roll = rng.random()
+        if roll < 0.4:
+            left.append(f"{first} {last}")
+        elif roll < 0.7:
+            left.append(f"{first.upper()} {typo(rng, last)}")
+        elif roll < 0.85:
+            left.append(f"{typo(rng, first)} {last}")
+        else:
+            left.append(f"{last.lower()}, {first.lower()}")
+    return left, right
+
+
+def main():
+    check_boundaries()
+    roster_size = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    left, right = generate_names(roster_size)
+
+    timer_start = perf_counter()
+    results = reconcile(left, right, DEFAULT_THRESHOLD)
+    elapsed = perf_counter() - timer_start
+
+    matched = sum(result.match is not None for result in results)
+    correct = sum(row in result.indexes for row, result in enumerate(results))
+    print(
+        f"{roster_size:,} x {roster_size:,} names  |  {elapsed:.2f} sec.  |  "
+        f"{matched:,} matched  |  {correct:,} to the source row"
+    )
+    print("\nBoundary checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Golden-corpus check and benchmark for the name engines in awards.formatting.
+
+name_golden_corpus.json holds every input with the output `Formatter.name`
+and `OutlookNameFormatter.format_name` gave before both moved onto the rule
+engine (errors are recorded by exception type). The check fails on any
+difference; after an intentional rule change, rerun with --update and bump
+FORMATTER_VERSION. Timings compare parsing every name (cache cleared) with
+the memoized path.
+
+usage: python bench_names.py [--update] [repeat]
+"""
+
+import json
+import sys
+from pathlib import Path
+from timeit import timeit
+
+from awards.formatting import (
+    NAME_ENGINE,
+    OUTLOOK_NAME_ENGINE,
+    Formatter,
+    OutlookNameFormatter,
+    name_cache_stats,
+)
+
+CORPUS_PATH: Path = Path(__file__).with_name("name_golden_corpus.json")
+
+
+def outlook_name(value: str) -> str | dict:
+    try:
+        return OutlookNameFormatter.format_name(value)
+    except Exception as e:
+        return {"error": type(e).__name__}
+
+
+FORMATTERS = {
+    "formatter_name": Formatter.name,
+    "outlook_format_name": outlook_name,
+}
+
+
+def load_corpus() -> dict[str, list[list]]:
+    with CORPUS_PATH.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_corpus(corpus: dict[str, list[list]]) -> None:
+    sections = []
+    for section, pairs in corpus.items():
+        rows = ",\n".join(f"  {json.dumps(pair, ensure_ascii=False)}" for pair in pairs)
+        sections.append(f' "{section}": [\n{rows}\n ]')
+    CORPUS_PATH.write_text("{\n" + ",\n".join(sections) + "\n}\n", encoding="utf-8")
+
+
+def check(corpus: dict[str, list[list]]) -> int:
+    failures = 0
+    for section, pairs in corpus.items():
+        format_name = FORMATTERS[section]
+        mismatches = [
+            (value, expected, actual)
+            for value, expected in pairs
+            if (actual := format_name(value)) != expected
+        ]
+        failures += len(mismatches)
+        print(f"{section.ljust(22)}{len(pairs):>6} names  {len(mismatches):>4} mismatches")
+        for value, expected, actual in mismatches[:10]:
+            print(f"    {value!r}: expected {expected!r}, got {actual!r}")
+    return failures
+
+
+def main():
+    args = sys.argv[1:]
+    corpus = load_corpus()
+    if "--update" in args:
+        args.remove("--update")
+        for section, pairs in corpus.items():
+            corpus[section] = [[value, FORMATTERS[section](value)] for value, _ in pairs]
+        save_corpus(corpus)
+        print(f"Rewrote {CORPUS_PATH.name}.")
+        return
+
+    if check(corpus):
+        sys.exit(1)
+
+    repeat = int(args[0]) if args else 20
+    for section, engine in (("formatter_name", NAME_ENGINE), ("outlook_format_name", OUTLOOK_NAME_ENGINE)):
+        values = [value for value, expected in corpus[section] if not isinstance(expected, dict)]
+        values = [value for value in values if value]
+        engine.cache_clear()
+        parsed_time = timeit(lambda: [engine.format.__wrapped__(value) for value in values], number=repeat)
+        cached_time = timeit(lambda: [engine.format(value) for value in values], number=repeat)
+        per_call = 1e6 / (repeat * len(values))
+        print(
+            f"{section.ljust(22)}parsed {parsed_time * per_call:6.2f} us/call  |  "
+            f"memoized {cached_time * per_call:6.2f} us/call  |  "
+            f"{parsed_time / cached_time:5.1f}x"
+        )
+    for name, info in name_cache_stats().items():
+        print(f"{name} cache: {info.hits} hits, {info.misses} misses, {info.currsize} entries")
+    print("\nAll outputs match the golden corpus.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark for org directory extraction over 1/2/4/8 worker processes.
+
+Generates a synthetic directory PDF (records in both the default and the
+alternate format, some straddling page breaks, some repeated under the same
+code), checks the parallel output matches the deduplicated serial scan
+record for record, and reports timings.
+
+usage: python bench_org_extraction.py [page_count]
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import fitz
+
+from extract_and_save_org_data import (
+    dedup_by_code,
+    extract_org_records_parallel,
+    iter_org_records,
+    iter_pdf_lines,
+)
+
+LINES_PER_PAGE: int = 48
+
+
+def _code(rng: random.Random) -> str:
+    return "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(10))
+
+
+def generate_directory_pdf(path: Path, page_count: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    lines: list[str] = []
+    records: list[list[str]] = []
+    while len(lines) < page_count * LINES_PER_PAGE:
+        if records and rng.random() < 0.05:
+            lines += rng.choice(records)
+            continue
+        symbol = f"{rng.choice('ABCDEFG')}{rng.choice('ABCDEFG')}-{rng.randint(1, 99)}"
+        title = f"Office of {rng.choice(['Budget', 'Awards', 'Payroll', 'Training'])} {rng.randint(1, 999)}"
+        if rng.random() < 0.5:
+            records.append([symbol, f"{_code(rng)} {title}", f"{_code(rng)} Effective 2024"])
+        else:
+            records.append([_code(rng), title, symbol, _code(rng)])
+        lines += records[-1]
+        lines += ["Notes:", "-"] if rng.random() < 0.3 else []
+
+    with fitz.open() as doc:
+        for page_start in range(0, len(lines), LINES_PER_PAGE):
+            page = doc.new_page()
+            text = "\n".join(lines[page_start : page_start + LINES_PER_PAGE])
+            page.insert_text((36, 36), text, fontsize=9)
+        doc.save(path)
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf_path = Path(tmp_dir) / "org_directory.pdf"
+        generate_directory_pdf(pdf_path, page_count)
+
+        timer_start = perf_counter()
+        expected = dedup_by_code(iter_org_records(iter_pdf_lines(str(pdf_path))))
+        serial_time = perf_counter() - timer_start
+        print(f"{page_count} pages, {len(expected)} org records")
+        print(f"serial scan:  {serial_time:8.3f} sec.")
+
+        for workers in (1, 2, 4, 8):
+            timer_start = perf_counter()
+            records = extract_org_records_parallel(str(pdf_path), workers)
+            elapsed = perf_counter() - timer_start
+            if records != expected:
+                raise AssertionError(f"{workers} workers: output differs from serial scan")
+            print(f"{workers} worker(s): {elapsed:8.3f} sec.  ({serial_time / elapsed:5.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
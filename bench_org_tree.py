@@ -0,0 +1,122 @@
+"""
+Benchmark and consistency check for OrgTree.
+
+Builds a random roster (supervisor chains of varying depth, some employees
+with only an official), checks headcount, reports, is_under and
+chain_of_command against a naive parent-pointer walk, removes a batch of
+employees with `apply_diff` and checks again (removed employees must drop
+out of the tree unless a remaining row still names them), then reports
+build and query timings.
+
+usage: python bench_org_tree.py [employee_count]
+"""
+
+import random
+import sys
+from time import perf_counter
+
+from hierarchy import HierarchyGraph
+
+
+def generate_rows(employee_count: int, seed: int = 0) -> list[tuple]:
+    rng = random.Random(seed)
+    officials = [f"Official {i}" for i in range(max(employee_count // 1000, 1))]
+    rows = [(official, None, None) for official in officials]
+    names = list(officials)
+    for i in range(employee_count):
+        name = f"Employee {i}"
+        official = rng.choice(officials)
+        supervisor = rng.choice(names[-50:]) if rng.random() < 0.95 else None
+        rows.append((name, supervisor, official))
+        names.append(name)
+    return rows
+
+
+def naive_parents(rows: list[tuple]) -> dict:
+    parents = {}
+    for employee, supervisor, official in rows:
+        parents[employee] = supervisor or (official if official != employee else None)
+        for manager in (supervisor, official):
+            if manager is not None:
+                parents.setdefault(manager, None)
+    return parents
+
+
+def naive_chain(parents: dict, name: str) -> list[str]:
+    chain = []
+    node = parents[name]
+    while node is not None:
+        chain.append(node)
+        node = parents[node]
+    return chain
+
+
+def check(tree, rows: list[tuple], samples: list[str]) -> None:
+    parents = naive_parents(rows)
+    members = set(tree.names[node] for node in tree.order)
+    if members != set(parents):
+        raise AssertionError(
+            f"tree has {len(members - set(parents))} extra and "
+            f"{len(set(parents) - members)} missing names"
+        )
+    under = {name: set() for name in parents}
+    for name in parents:
+        for manager in naive_chain(parents, name):
+            under[manager].add(name)
+    for name in samples:
+        if tree.chain_of_command(name) != naive_chain(parents, name):
+            raise AssertionError(f"chain_of_command differs for {name}")
+        if tree.headcount(name) != len(under[name]) or set(tree.reports(name)) != under[name]:
+            raise AssertionError(f"reports differ for {name}")
+        manager = parents[name]
+        if manager is not None and not tree.is_under(name, manager):
+            raise AssertionError(f"{name} not under {manager}")
+
+
+def main():
+    employee_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = random.Random(1)
+    rows = generate_rows(employee_count)
+
+    graph = HierarchyGraph()
+    timer_start = perf_counter()
+    graph.add_rows(rows)
+    tree = graph.to_tree()
+    build_time = perf_counter() - timer_start
+
+    samples = rng.sample([row[0] for row in rows], min(200, len(rows)))
+    check(tree, rows, samples)
+
+    timer_start = perf_counter()
+    for name in samples * 50:
+        tree.headcount(name)
+        tree.is_under(name, samples[0])
+    query_time = perf_counter() - timer_start
+
+    # Removed employees that no remaining row names must leave the tree.
+    leaves = {row[0] for row in rows} - {row[1] for row in rows} - {row[2] for row in rows}
+    removed = rng.sample(sorted(leaves), min(100, len(leaves)))
+    removed.append(rng.choice([row[1] for row in rows if row[1] is not None]))
+    graph.apply_diff([], removed=removed)
+    remaining = [row for row in rows if row[0] not in set(removed)]
+    tree = graph.to_tree()
+    check(tree, remaining, [name for name in samples if name not in set(removed)])
+    for name in removed:
+        still_named = any(name in (row[1], row[2]) for row in remaining)
+        try:
+            tree.headcount(name)
+            present = True
+        except KeyError:
+            present = False
+        if present != still_named:
+            raise AssertionError(f"removed employee {name} present={present}")
+
+    print(
+        f"{employee_count:,} employees  |  build {build_time:.3f} sec.  |  "
+        f"{len(samples) * 100:,} queries {query_time * 1e3:.1f} ms  |  "
+        f"{len(removed)} removals checked"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+HISTORY_PATH: Path = Path("benchmark_history.jsonl")
+
+
+@dataclass
+class BenchmarkRun:
+    benchmark: str
+    params: dict[str, Any]
+    algorithm: str
+    metrics: dict[str, Any] = field(default_factory=dict)
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory_kb: Optional[int] = None
+    python_version: str = field(default_factory=platform.python_version)
+    platform: str = field(default_factory=platform.platform)
+    cpu_count: Optional[int] = field(default_factory=os.cpu_count)
+    timestamp: str = field(
+        default_factory=lambda: datetime.now().replace(microsecond=0).isoformat()
+    )
+
+    @property
+    def key(self) -> str:
+        """Runs with the same key measure the same thing and can be compared."""
+        return f"{self.benchmark} [{self.algorithm}] {json.dumps(self.params, sort_keys=True)}"
+
+
+def measure(
+    benchmark: str,
+    params: dict[str, Any],
+    algorithm: str,
+    func: Callable[[], Any],
+    trace_memory: bool = False,
+) -> tuple[BenchmarkRun, Any]:
+    """
+    Runs func once and returns the populated run together with func's result.
+    With trace_memory, func runs a second time under tracemalloc (so tracing
+    does not skew the timings) and peak_memory_kb is that run's own peak of
+    Python allocations in this process; worker processes are not included.
+    """
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    result = func()
+    run = BenchmarkRun(
+        benchmark=benchmark,
+        params=params,
+        algorithm=algorithm,
+        wall_time=time.perf_counter() - wall_start,
+        cpu_time=time.process_time() - cpu_start,
+    )
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        run.peak_memory_kb = peak // 1024
+    return run, result
+
+
+class BenchmarkHistory:
+    """
+    Append-only JSON Lines store of benchmark runs.
+
+    Recording a run appends one line and never rewrites earlier entries, so
+    concurrent or interrupted runs cannot corrupt the history.
+    """
+
+    def __init__(self, path: Path | str = HISTORY_PATH):
+        self.path = Path(path)
+
+    def record(self, run: BenchmarkRun) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(run), sort_keys=True) + "\n")
+
+    def runs(self, benchmark: Optional[str] = None) -> list[BenchmarkRun]:
+        if not self.path.exists():
+            return []
+        runs = []
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                run = BenchmarkRun(**json.loads(line))
+                if benchmark is None or run.benchmark == benchmark:
+                    runs.append(run)
+        return runs
+
+    def compare(
+        self, benchmark: Optional[str] = None, threshold: float = 0.10
+    ) -> list[dict[str, Any]]:
+        """
+        Compares the latest run of every benchmark/algorithm/params key with the run before it.
+        A wall time increase above `threshold` (fractional) is flagged as a regression.
+        """
+        latest: dict[str, list[BenchmarkRun]] = {}
+        for run in self.runs(benchmark):
+            latest.setdefault(run.key, []).append(run)
+
+        comparisons = []
+        for key, history in latest.items():
+            if len(history) < 2:
+                continue
+            previous, current = history[-2], history[-1]
+            change = (
+                (current.wall_time - previous.wall_time) / previous.wall_time
+                if previous.wall_time
+                else 0.0
+            )
+            comparisons.append(
+                {
+                    "key": key,
+                    "previous": previous,
+                    "current": current,
+                    "change": change,
+                    "regression": change > threshold,
+                    "metrics_changed": previous.metrics != current.metrics,
+                }
+            )
+        return comparisons
+
+    def report(self, benchmark: Optional[str] = None, threshold: float = 0.10) -> str:
+        lines = []
+        for comparison in self.compare(benchmark, threshold):
+            previous, current = comparison["previous"], comparison["current"]
+            flags = []
+            if comparison["regression"]:
+                flags.append("REGRESSION")
+            if comparison["metrics_changed"]:
+                flags.append("RESULTS CHANGED")
+            lines.append(
+                f"{comparison['key']}\n"
+                f"    {previous.timestamp}: {previous.wall_time:.6f} sec.\n"
+                f"    {current.timestamp}: {current.wall_time:.6f} sec."
+                f"  ({comparison['change']:+.1%})  {' '.join(flags)}".rstrip()
+            )
+        return "\n".join(lines) if lines else "No comparable runs recorded."
+
+
+if __name__ == "__main__":
+    print(BenchmarkHistory().report(sys.argv[1] if len(sys.argv) > 1 else None))
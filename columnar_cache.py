@@ -0,0 +1,127 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.feather as feather
+    import pyarrow.ipc
+except ImportError:  # sidecars are pickled instead (no memory mapping)
+    pyarrow = None
+
+DEFAULT_CACHE_DIR: Path = Path.home() / ".award_cache" / "columnar"
+CACHE_VERSION: str = "1"
+
+
+class ColumnarCache:
+    """
+    Columnar sidecars for slow-to-parse workbooks.
+
+    The first load parses the workbook with `reader` and stores the whole
+    frame as an uncompressed Feather (Arrow IPC) file; later loads memory-map
+    that file and materialize only the requested columns. Sidecars are keyed
+    by resolved path, size, mtime and a `variant` naming how the workbook was
+    read (e.g. dtype=str), so an edited workbook is re-parsed and older
+    sidecars for the same path are removed. Without pyarrow, or when a frame
+    cannot be represented in Arrow, the sidecar is a pickle.
+    """
+
+    def __init__(self, cache_dir: Path | str = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _sidecar_stem(self, file_path: Path, variant: str) -> tuple[str, str]:
+        resolved = str(file_path.resolve())
+        stat = file_path.stat()
+        path_key = hashlib.sha256(f"{resolved}|{variant}".encode()).hexdigest()[:20]
+        stamp_key = hashlib.sha256(
+            f"{stat.st_size}|{stat.st_mtime_ns}|{CACHE_VERSION}".encode()
+        ).hexdigest()[:12]
+        return path_key, f"{path_key}-{stamp_key}"
+
+    def _find(self, stem: str) -> Optional[Path]:
+        suffixes = (".feather", ".pkl") if pyarrow is not None else (".pkl",)
+        for suffix in suffixes:
+            sidecar = self.cache_dir / f"{stem}{suffix}"
+            if sidecar.exists():
+                return sidecar
+        return None
+
+    @staticmethod
+    def _check_columns(available: Sequence[str], columns: Optional[Sequence[str]], file_path: Path) -> None:
+        missing = [col for col in columns or () if col not in available]
+        if missing:
+            raise ValueError(f"Missing columns in {file_path.name}: {', '.join(missing)}")
+
+    def _read_sidecar(self, sidecar: Path, columns: Optional[Sequence[str]], file_path: Path) -> pd.DataFrame:
+        if sidecar.suffix == ".feather":
+            with pyarrow.memory_map(str(sidecar)) as source:
+                self._check_columns(pyarrow.ipc.open_file(source).schema.names, columns, file_path)
+            table = feather.read_table(
+                sidecar, columns=list(columns) if columns is not None else None, memory_map=True
+            )
+            df = table.to_pandas()
+            # Arrow nulls come back as None in object columns; the workbook
+            # reader gave NaN, and a warm load must return the same frame.
+            object_cols = [col for col in df.columns if df[col].dtype == object]
+            if object_cols:
+                df[object_cols] = df[object_cols].where(df[object_cols].notna(), np.nan)
+            return df
+        with sidecar.open("rb") as f:
+            df = pickle.load(f)
+        self._check_columns(df.columns, columns, file_path)
+        return df[list(columns)] if columns is not None else df
+
+    def _write_sidecar(self, df: pd.DataFrame, path_key: str, stem: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.cache_dir.glob(f"{path_key}-*"):
+            stale.unlink(missing_ok=True)
+        if pyarrow is not None:
+            temp_path = self.cache_dir / f"{stem}.feather.{os.getpid()}.tmp"
+            try:
+                feather.write_feather(df, temp_path, compression="uncompressed")
+                os.replace(temp_path, self.cache_dir / f"{stem}.feather")
+                return
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, ValueError):
+                temp_path.unlink(missing_ok=True)  # mixed-type columns; pickle instead
+        temp_path = self.cache_dir / f"{stem}.pkl.{os.getpid()}.tmp"
+        with temp_path.open("wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.cache_dir / f"{stem}.pkl")
+
+    def load(
+        self,
+        file_path: Path | str,
+        reader: Callable[[Path], pd.DataFrame],
+        columns: Optional[Sequence[str]] = None,
+        variant: str = "",
+    ) -> pd.DataFrame:
+        """
+        Returns `reader(file_path)` (all columns, or only `columns`), reading
+        the workbook itself only when no current sidecar exists.
+        """
+        file_path = Path(file_path)
+        path_key, stem = self._sidecar_stem(file_path, variant)
+        sidecar = self._find(stem)
+        if sidecar is not None:
+            try:
+                df = self._read_sidecar(sidecar, columns, file_path)
+                self.hits += 1
+                return df
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                print(f"Ignoring unreadable cache file {sidecar.name}: {e}")
+        self.misses += 1
+        df = reader(file_path)
+        self._write_sidecar(df, path_key, stem)
+        self._check_columns(df.columns, columns, file_path)
+        return df[list(columns)] if columns is not None else df
+
+    def clear(self) -> None:
+        for sidecar in self.cache_dir.glob("*-*.*"):
+            sidecar.unlink(missing_ok=True)
@@ -65,6 +65,7 @@ from typing import Optional
 import fitz
 
 from awards.constants import CONSULTANT_MAP, EvalManager
+from awards.extraction_cache import ExtractionCache
 from awards.formatting import Formatter
 from awards.logger import Logger
 from awards.utils import IDManager, find_mgmt_division
@@ -113,29 +114,65 @@ class BaseDetails:
                 f"Source path '{self.source_path}' is not a file or does not exist."
             )
 
-    def extract_pdf_data(self) -> dict[str, Optional[str]]:
+    @staticmethod
+    def read_pdf_fields(
+        source_path: Path, cache: Optional[ExtractionCache] = None
+    ) -> tuple[str, dict[str, Optional[str]], int]:
+        """
+        Reads the award category and cleaned widget data from a PDF.
+
+        Does not touch `IDManager`, so it is safe to call from worker processes.
+        Returns the category, the cleaned data and the number of widgets read.
+        """
+        if cache is None:
+            return BaseDetails._read_pdf_fields(source_path)
+        payload = cache.cached(
+            source_path,
+            "award_fields",
+            lambda: BaseDetails._read_pdf_fields(source_path),
+        )
+        category, pdf_data, widget_count = payload
+        return category, pdf_data, widget_count
+
+    @staticmethod
+    def _read_pdf_fields(source_path: Path) -> tuple[str, dict[str, Optional[str]], int]:
+        pdf_data: dict[str, Optional[str]] = {}
+        widget_count: int = 0
         warnings.filterwarnings("ignore", module="pymupdf")
-        with fitz.open(self.source_path) as doc:
+        with fitz.open(source_path) as doc:
             if doc.page_count == 2:
-                self.category = "IND"
+                category = "IND"
             elif doc.page_count in [3, 4, 5]:
-                self.category = "GRP"
+                category = "GRP"
             else:
                 raise ValueError(
                     f"Invalid page count. Expected: [2, 3, 4, 5]  |  Received: {doc.page_count}"
                 )
-            self.log_id = IDManager.get(self.category)
             for page in doc:
                 for field in page.widgets():
                     key = formatter.key(field.field_name)
                     val = formatter.clean(field.field_value)
-                    self.pdf_data[key] = val
+                    pdf_data[key] = val
+                    widget_count += 1
 
-        if not self.pdf_data:
+        if not pdf_data:
             raise ValueError("No data extracted from the PDF.")
         warnings.resetwarnings()
+        return category, pdf_data, widget_count
+
+    def load_pdf_data(
+        self, category: str, pdf_data: dict[str, Optional[str]], log_id: Optional[str] = None
+    ) -> None:
+        """Applies already extracted PDF data and assigns a log ID if none is given."""
+        self.category = category
+        self.pdf_data = dict(pdf_data)
+        self.log_id = log_id if log_id else IDManager.get(self.category)
         logger.info(f"Extracted {len(self.pdf_data)} items from PDF.")
 
+    def extract_pdf_data(self, cache: Optional[ExtractionCache] = None) -> None:
+        category, pdf_data, _ = self.read_pdf_fields(self.source_path, cache)
+        self.load_pdf_data(category, pdf_data)
+
     def get_first_match(self, *keys: str) -> Optional[str]:
         for key in keys:
             if key in self.pdf_data:
@@ -1,9 +1,11 @@
 import json
 from collections import Counter
 from pathlib import Path
+from typing import Optional
 
 import fitz
 
+from awards.extraction_cache import ExtractionCache
 from awards.formatting import Formatter
 
 formatter = Formatter()
@@ -12,21 +14,33 @@ formatter = Formatter()
 class DataCollector:
     data: dict[int, list[str]] = {}
 
-    def extract(self, file: Path) -> None:
+    @staticmethod
+    def _read_pages(file: Path) -> list[list]:
+        pages = []
         with fitz.open(file) as doc:
             for page in doc:
-                n: int = page.number
-                self.data.setdefault(n, [])
-                for field in page.widgets():
-                    val = formatter.numerical(field.field_name)
-                    key = formatter.clean(field.field_value)
-                    self.data[val].append(key)
+                fields = [
+                    [formatter.numerical(field.field_name), formatter.clean(field.field_value)]
+                    for field in page.widgets()
+                ]
+                pages.append([page.number, fields])
+        return pages
+
+    def extract(self, file: Path, cache: Optional[ExtractionCache] = None) -> None:
+        if cache is None:
+            pages = self._read_pages(file)
+        else:
+            pages = cache.cached(file, "page_values", lambda: self._read_pages(file))
+        for n, fields in pages:
+            self.data.setdefault(n, [])
+            for val, key in fields:
+                self.data[val].append(key)
         print(f"Extracted all values from {file.name}")
 
-    def process_files(self) -> None:
+    def process_files(self, cache: Optional[ExtractionCache] = None) -> None:
         folder: Path = Path("")
         for file in folder.glob("*.pdf"):
-            self.extract(file)
+            self.extract(file, cache)
         print(f"Extracted {len(self.data)} pages")
 
     def count_values(self) -> None:
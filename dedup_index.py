@@ -0,0 +1,243 @@
+import json
+import math
+import sqlite3
+import struct
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+from awards.award_batch import extract_batch
+from awards.configs import BaseDetails
+from awards.formatting import Formatter
+from awards.hashitems import Hash
+from awards.logger import Logger
+
+logger = Logger()
+
+DEFAULT_INDEX_PATH: Path = Path("nomination_keys.sqlite3")
+FIELD_MAP_PATH: Path = Path(__file__).with_name("pdf_field_name_data.json")
+SQL_BATCH_SIZE: int = 500
+
+
+class BloomFilter:
+    """
+    Bit-array Bloom filter over derived keys.
+
+    Keys are already SHA-256 based hex strings, so the bit positions are taken
+    from the key itself (double hashing) instead of re-hashing.
+    """
+
+    HEADER = struct.Struct("<QIQ")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, 1)
+        self.num_bits = max(
+            8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterable[int]:
+        first, second = int(key[:16], 16), int(key[16:32], 16) | 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    def save(self, path: Path) -> None:
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        data = Path(path).read_bytes()
+        num_bits, num_hashes, count = cls.HEADER.unpack_from(data)
+        bloom = cls.__new__(cls)
+        bloom.num_bits, bloom.num_hashes, bloom.count = num_bits, num_hashes, count
+        bloom.capacity = max(1, round(num_bits * math.log(2) / num_hashes))
+        bloom.bits = bytearray(data[cls.HEADER.size :])
+        return bloom
+
+
+class DedupIndex:
+    """
+    Persistent set of nomination keys (`Hash.create_hash` of nominee,
+    nominator and value).
+
+    Keys live in a WITHOUT ROWID SQLite table, so the primary key B-tree is
+    the covering index. An in-memory Bloom filter (saved next to the
+    database) answers most "not seen before" lookups without touching SQLite.
+    """
+
+    def __init__(self, db_path: Path | str = DEFAULT_INDEX_PATH, capacity: int = 1_000_000):
+        self.db_path = Path(db_path)
+        self.bloom_path = self.db_path.with_suffix(".bloom")
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS keys (key TEXT PRIMARY KEY, source TEXT) WITHOUT ROWID"
+        )
+        stored = self.conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+        bloom = BloomFilter.load(self.bloom_path) if self.bloom_path.exists() else None
+        if bloom is None or bloom.count != stored:
+            self.rebuild_bloom(max(capacity, stored * 2))
+        else:
+            self.bloom = bloom
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def rebuild_bloom(self, capacity: Optional[int] = None) -> None:
+        self.bloom = BloomFilter(capacity or max(1_000_000, len(self) * 2))
+        for (key,) in self.conn.execute("SELECT key FROM keys"):
+            self.bloom.add(key)
+        self.bloom.save(self.bloom_path)
+
+    def lookup_many(self, keys: Iterable[str]) -> set[str]:
+        """Returns the subset of keys already in the index."""
+        candidates = list({key for key in keys if key and key in self.bloom})
+        found: set[str] = set()
+        for i in range(0, len(candidates), SQL_BATCH_SIZE):
+            batch = candidates[i : i + SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            found.update(
+                key
+                for (key,) in self.conn.execute(
+                    f"SELECT key FROM keys WHERE key IN ({placeholders})", batch
+                )
+            )
+        return found
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self.lookup_many([key]))
+
+    def add_many(self, keys: Iterable[str], source: Optional[str] = None) -> int:
+        """Inserts keys, returning how many were new."""
+        keys = [key for key in dict.fromkeys(keys) if key]
+        existing = self.lookup_many(keys)
+        new_keys = [key for key in keys if key not in existing]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO keys VALUES (?, ?)",
+                ((key, source) for key in new_keys),
+            )
+        for key in new_keys:
+            self.bloom.add(key)
+        if self.bloom.count > self.bloom.capacity:
+            self.rebuild_bloom(self.bloom.count * 2)
+        else:
+            self.bloom.save(self.bloom_path)
+        return len(new_keys)
+
+    def rebuild_from_exports(self, export_paths: Iterable[Path | str]) -> int:
+        """
+        Re-indexes historic `GroupAward.export_json` output (one JSON object
+        per file, or a list of them). Returns the number of keys added.
+        """
+        added = 0
+        for export_path in export_paths:
+            with open(export_path, encoding="utf-8") as f:
+                exports = json.load(f)
+            for export in exports if isinstance(exports, list) else [exports]:
+                nominees = [
+                    employee.get("Name")
+                    for employee in (export.get("employees") or {}).values()
+                ]
+                keys = nomination_keys(
+                    nominees, export.get("nominator_name"), export.get("value")
+                )
+                added += self.add_many(keys, source=export.get("source_path"))
+        logger.info(f"Indexed {added} keys from historic exports.")
+        return added
+
+    def close(self) -> None:
+        self.bloom.save(self.bloom_path)
+        self.conn.close()
+
+
+def nomination_keys(
+    nominees: Iterable[Optional[str]], nominator: Optional[str], value: Optional[str]
+) -> list[str]:
+    """One key per nominee; names are normalized with `Formatter.name` first."""
+    nominator = Formatter.name(nominator) if nominator else None
+    rows = [(Formatter.name(nominee), nominator, value) for nominee in nominees if nominee]
+    if not rows:
+        return []
+    return [key for key in Hash.create_hashes(*zip(*rows)) if key]
+
+
+def _load_field_map() -> dict:
+    with FIELD_MAP_PATH.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def keys_from_pdf_data(award: BaseDetails, field_map: dict) -> list[str]:
+    """Derives nomination keys from an award whose `pdf_data` is loaded."""
+    recipients = field_map["recipients"][award.category]
+    nominees = [
+        award.get_first_match(*fields["name"])
+        for fields in recipients.values()
+        if fields.get("name")
+    ]
+    nominator = award.get_first_match(*field_map["nominator"]["name"])
+    award.set_value()
+    return nomination_keys(nominees, nominator, award.value)
+
+
+def check_folder(folder: Path | str, index: DedupIndex, add: bool = False) -> dict[str, list[str]]:
+    """
+    Checks every award PDF in a folder against the index.
+
+    Returns {file name: duplicate keys} for files with duplicates. With
+    `add`, keys of files without duplicates are inserted afterwards.
+    """
+    field_map = _load_field_map()
+    duplicates: dict[str, list[str]] = {}
+    for result in extract_batch(folder, assign_log_ids=False):
+        if not result.ok:
+            continue
+        award = BaseDetails()
+        award.category, award.pdf_data = result.category, result.pdf_data
+        keys = keys_from_pdf_data(award, field_map)
+        seen = index.lookup_many(keys)
+        if seen:
+            duplicates[result.source_path.name] = sorted(seen)
+            logger.warning(f"{result.source_path.name}: {len(seen)} duplicate nomination(s).")
+        elif add:
+            index.add_many(keys, source=result.source_path.name)
+    return duplicates
+
+
+def main():
+    usage = (
+        "usage: dedup_index.py check <pdf_folder> [--add]\n"
+        "       dedup_index.py rebuild <export.json> [...]"
+    )
+    if len(sys.argv) < 3 or sys.argv[1] not in ("check", "rebuild"):
+        print(usage)
+        sys.exit(1)
+
+    index = DedupIndex()
+    try:
+        if sys.argv[1] == "check":
+            duplicates = check_folder(sys.argv[2], index, add="--add" in sys.argv[3:])
+            for file_name, keys in duplicates.items():
+                print(f"{file_name}  |  {', '.join(keys)}")
+            print(f"\n{len(duplicates)} file(s) with duplicates. {len(index)} keys indexed.")
+        else:
+            index.rebuild_from_exports(sys.argv[2:])
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Callable, Iterable, Optional
+
+# inotify(7) event flags
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+IGNORED_SUFFIXES: tuple[str, ...] = (".partial", ".tmp", ".crdownload", ".part", ".download")
+
+
+class _InotifyBackend:
+    """Linux inotify through libc; raises OSError where it is unavailable."""
+
+    def __init__(self, directories: list[Path]):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories: dict[int, Path] = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {directory}")
+            self.directories[wd] = directory
+
+    def poll(self, timeout: float) -> tuple[list[Path], bool]:
+        """Returns (changed paths, overflowed) for events within `timeout` seconds."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return [], False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return [], False
+        paths, overflowed, offset = [], False, 0
+        while offset < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + name_len].rstrip(b"\0")
+            offset += name_len
+            if mask & IN_Q_OVERFLOW:
+                overflowed = True
+            elif name and wd in self.directories:
+                paths.append(self.directories[wd] / os.fsdecode(name))
+        return paths, overflowed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Portable fallback: rescans the directories and diffs (size, mtime)."""
+
+    def __init__(self, directories: list[Path]):
+        self.directories = directories
+        self.seen: dict[Path, tuple[int, int]] = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        snapshot[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+        return snapshot
+
+    def poll(self, timeout: float) -> tuple[list[Path], bool]:
+        sleep(timeout)
+        current = self._scan()
+        changed = [path for path, stamp in current.items() if self.seen.get(path) != stamp]
+        self.seen = current
+        return changed, False
+
+    def close(self) -> None:
+        pass
+
+
+class DirectoryWatcher:
+    """
+    Watches directories and hands settled files to `handler` on a work queue.
+
+    A file is dispatched once no event has been seen for it for `debounce`
+    seconds and its size and mtime are unchanged since the last check, so
+    files still being written or downloaded are not picked up half-way.
+    inotify is used on Linux, with directory polling everywhere else.
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[Path | str],
+        handler: Callable[[Path], None],
+        file_filter: Optional[Callable[[Path], bool]] = None,
+        debounce: float = 2.0,
+        poll_interval: float = 1.0,
+        workers: int = 1,
+        initial_scan: bool = True,
+        use_polling: bool = False,
+    ):
+        self.directories = [Path(directory) for directory in dict.fromkeys(directories)]
+        self.handler = handler
+        self.file_filter = file_filter
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self.initial_scan = initial_scan
+        self.use_polling = use_polling
+        self.queue: queue.Queue[Optional[Path]] = queue.Queue()
+        self._pending: dict[Path, tuple[float, Optional[tuple[int, int]]]] = {}
+        self._queued: set[Path] = set()
+        self._queued_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _wanted(self, path: Path) -> bool:
+        if path.name.startswith(("$", "~$", ".")) or path.name.endswith(IGNORED_SUFFIXES):
+            return False
+        return self.file_filter is None or self.file_filter(path)
+
+    def _open_backend(self):
+        if not self.use_polling:
+            try:
+                return _InotifyBackend(self.directories)
+            except OSError as e:
+                print(f"- inotify unavailable ({e}); polling every {self.poll_interval} sec.")
+        return _PollingBackend(self.directories)
+
+    def _scan_existing(self) -> list[Path]:
+        return [
+            path
+            for directory in self.directories
+            if directory.is_dir()
+            for path in directory.iterdir()
+            if path.is_file()
+        ]
+
+    def _note(self, paths: Iterable[Path]) -> None:
+        now = monotonic()
+        for path in paths:
+            if self._wanted(path):
+                _, stamp = self._pending.get(path, (now, None))
+                self._pending[path] = (now, stamp)
+
+    def _dispatch_settled(self) -> None:
+        now = monotonic()
+        for path, (last_event, stamp) in list(self._pending.items()):
+            if now - last_event < self.debounce:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                del self._pending[path]  # moved or deleted before it settled
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != stamp:
+                self._pending[path] = (now, current)  # still changing; wait again
+                continue
+            del self._pending[path]
+            with self._queued_lock:
+                if path in self._queued:
+                    self._pending[path] = (now, current)  # handled after current run
+                    continue
+                self._queued.add(path)
+            self.queue.put(path)
+
+    def _worker(self) -> None:
+        while (path := self.queue.get()) is not None:
+            try:
+                if path.exists():
+                    self.handler(path)
+            except Exception as e:
+                print(f"- ERROR: {path.name}: {e}")
+            finally:
+                with self._queued_lock:
+                    self._queued.discard(path)
+                self.queue.task_done()
+        self.queue.task_done()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        """Blocks until `stop` is called or the process is interrupted."""
+        backend = self._open_backend()
+        threads = [
+            threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        if self.initial_scan:
+            self._note(self._scan_existing())
+        print(f"Watching {', '.join(map(str, self.directories))}  (Ctrl+C to stop)\n")
+        try:
+            while not self._stop.is_set():
+                timeout = min(self.poll_interval, self.debounce) if self._pending else self.poll_interval
+                paths, overflowed = backend.poll(timeout)
+                if overflowed:
+                    paths.extend(self._scan_existing())
+                self._note(paths)
+                self._dispatch_settled()
+        except KeyboardInterrupt:
+            print("\nStopping watcher...")
+        finally:
+            backend.close()
+            for _ in threads:
+                self.queue.put(None)
+            for thread in threads:
+                thread.join()
@@ -1,15 +1,55 @@
+import heapq
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from time import sleep
+from time import perf_counter, sleep
+from typing import Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 from rich.console import Console
 from rich.traceback import install
 
+from columnar_cache import ColumnarCache
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:  # parts are pickled and Parquet output is unavailable
+    pyarrow = None
+
 install(show_locals=True)
 console = Console()
 
 identifier_cols = ["name", "UUID", "position", "company", "location"]
 
+# calamine (pandas >= 2.2 with python-calamine installed) reads xlsx several
+# times faster than openpyxl; read_workbook falls back when it is missing.
+EXCEL_ENGINES: tuple[str, ...] = ("calamine", "openpyxl")
+PARTITIONS: int = 16
+PART_SUFFIX: str = ".parquet" if pyarrow is not None else ".pkl"
+
+
+class StageTimer:
+    """Wall time per pipeline stage, shown with a status spinner while running."""
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        timer_start = perf_counter()
+        with console.status(f"{name}..."):
+            yield
+        self.stages[name] = self.stages.get(name, 0.0) + perf_counter() - timer_start
+
+    def report(self) -> None:
+        padding = max((len(name) for name in self.stages), default=0) + 2
+        for name, elapsed in self.stages.items():
+            console.print(f"[blue]{(name + ':').ljust(padding)}{elapsed:8.3f} sec.[/blue]")
+        console.print(f"[blue]{'total:'.ljust(padding)}{sum(self.stages.values()):8.3f} sec.[/blue]")
+
 
 def generate_new(file_path: Path) -> Path:
     """
@@ -25,48 +65,382 @@ def generate_new(file_path: Path) -> Path:
     return new_path
 
 
-def merge_employee_functions(input_file: Path):
+def _read_excel(file_path: Path) -> pd.DataFrame:
+    for engine in EXCEL_ENGINES:
+        try:
+            return pd.read_excel(file_path, engine=engine)
+        except (ImportError, ValueError) as e:
+            if engine == EXCEL_ENGINES[-1] or "calamine" not in str(e).lower():
+                raise
+    raise ValueError(f"No Excel engine available for {file_path}")
+
+
+def read_workbook(file_path: Path, usecols: Optional[list[str]] = None) -> pd.DataFrame:
+    """
+    Reads the first sheet with the fastest available engine. The workbook is
+    parsed once and kept as a columnar sidecar; later runs only load `usecols`.
+    """
+    return ColumnarCache().load(file_path, _read_excel, columns=usecols)
+
+
+def to_identifier_category(column: pd.Series) -> pd.Series:
     """
-    Merge employee functions from an Excel file.
+    Same labels as `column.astype(str).str.strip()`, as a categorical with
+    sorted categories. Only the distinct values are converted and stripped;
+    missing values keep their own spelling ("None", "nan", "NaT").
     """
-    with console.status("Loading Excel file..."):
-        sleep(1.5)
-        df = pd.read_excel(input_file, engine="openpyxl")
+    codes, uniques = pd.factorize(column, use_na_sentinel=True)
+    labels = pd.Index(uniques).astype(str).str.strip()
+    missing = codes == -1
+    if missing.any():
+        missing_labels = column[missing].map(str)
+        missing_uniques = pd.Index(missing_labels.unique())
+        codes[missing] = len(labels) + missing_uniques.get_indexer(missing_labels)
+        labels = labels.append(missing_uniques)
+    label_codes, categories = pd.factorize(labels, sort=True)
+    return pd.Series(
+        pd.Categorical.from_codes(label_codes[codes], categories=categories),
+        index=column.index,
+        name=column.name,
+    )
+
+
+def normalize_identifiers(df: pd.DataFrame, columns: Iterable[str] = identifier_cols) -> pd.DataFrame:
+    for col in columns:
+        if col in df.columns:
+            df[col] = to_identifier_category(df[col])
+    return df
+
+
+def _write_part(df: pd.DataFrame, part_path: Path) -> None:
+    if pyarrow is not None:
+        try:
+            df.to_parquet(part_path, index=False)
+            return
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, ValueError):
+            part_path.unlink(missing_ok=True)  # mixed-type columns; pickle instead
+    df.to_pickle(part_path.with_suffix(".pkl"))
 
-        df[identifier_cols] = df[identifier_cols].apply(
-            lambda col: col.astype(str).str.strip()
+
+def _read_part(part_path: Path, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    if part_path.suffix == ".parquet":
+        return pd.read_parquet(part_path, columns=columns)
+    df = pd.read_pickle(part_path)
+    return df[columns] if columns is not None else df
+
+
+def _part_path(part_dir: Path, bucket: int, file_index: int) -> Path:
+    return part_dir / f"{bucket:03d}-{file_index:05d}{PART_SUFFIX}"
+
+
+def _partition_workbook(
+    file_path: Path,
+    file_index: int,
+    part_dir: Path,
+    partitions: int,
+    usecols: Optional[list[str]] = None,
+    normalize: bool = True,
+) -> tuple[str, int, list[str]]:
+    """
+    Process pool worker: reads one workbook, normalizes the identifier
+    columns (unless `normalize` is False) and writes its rows to
+    `partitions` hash partitions on disk (one part when `partitions` is 1).
+    Returns (file name, rows, columns).
+    """
+    df = read_workbook(file_path, usecols)
+    if normalize:
+        df = normalize_identifiers(df)
+    keys = [col for col in identifier_cols if col in df.columns]
+    if partitions > 1 and keys:
+        # Hash the labels rather than the category codes, which differ per file.
+        hashes = pd.util.hash_pandas_object(df[keys].astype(str), index=False)
+        buckets = (hashes % partitions).to_numpy()
+        for bucket, part in df.groupby(buckets, sort=False):
+            _write_part(part, _part_path(part_dir, int(bucket), file_index))
+    else:
+        _write_part(df, _part_path(part_dir, 0, file_index))
+    return file_path.name, len(df), list(df.columns)
+
+
+def partition_workbooks(
+    input_files: list[Path],
+    part_dir: Path,
+    partitions: int = 1,
+    usecols: Optional[list[str]] = None,
+    max_workers: Optional[int] = None,
+    normalize: bool = True,
+) -> list[tuple[str, int, list[str]]]:
+    """
+    Reads the workbooks concurrently in a process pool (inline with one
+    worker or one file) and returns the per-file summaries in input order.
+    """
+    args = [
+        (path, idx, part_dir, partitions, usecols, normalize)
+        for idx, path in enumerate(input_files)
+    ]
+    if max_workers == 1 or len(input_files) == 1:
+        return [_partition_workbook(*arg) for arg in args]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_partition_workbook, *zip(*args)))
+
+
+def _arrow_column(values: pd.Series, arrow_type=None):
+    """
+    `values` as an Arrow array (of `arrow_type` when given). Columns Arrow
+    cannot take as they are (mixed ints and strings) become strings.
+    """
+    try:
+        array = pyarrow.Array.from_pandas(values)
+        if arrow_type is None:
+            return pyarrow.nulls(len(array), pyarrow.string()) if pyarrow.types.is_null(array.type) else array
+        return array if array.type == arrow_type else array.cast(arrow_type)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError):
+        if arrow_type is not None and not pyarrow.types.is_string(arrow_type):
+            raise
+        return pyarrow.array(
+            [None if pd.isna(value) else str(value) for value in values], type=pyarrow.string()
         )
-        df = df.dropna(subset=identifier_cols, how="all")
 
-        df.sort_values(by=identifier_cols, inplace=True)
 
-        merged_df = df.groupby(identifier_cols, as_index=False)["function"].agg(
-            lambda funcs: "\n\n".join(
-                f.strip() for f in funcs if isinstance(f, str) and f.strip()
+def unified_schema(part_paths: list[Path], columns: list[str]):
+    """
+    Parquet schema for `columns` across parts: a column keeps its type when
+    every part that has values agrees on it, and is written as strings
+    otherwise (or when it is empty everywhere).
+    """
+    types: dict[str, set] = {col: set() for col in columns}
+    for part_path in part_paths:
+        if part_path.suffix == ".parquet":
+            schema = pq.read_schema(part_path)
+            part_types = {col: schema.field(col).type for col in columns if col in schema.names}
+        else:
+            df = _read_part(part_path)
+            part_types = {col: _arrow_column(df[col]).type for col in columns if col in df.columns}
+        for col, arrow_type in part_types.items():
+            if not pyarrow.types.is_null(arrow_type):
+                types[col].add(arrow_type)
+    return pyarrow.schema(
+        [(col, types[col].pop() if len(types[col]) == 1 else pyarrow.string()) for col in columns]
+    )
+
+
+class TableWriter:
+    """
+    Writes DataFrame chunks to .parquet, .csv or .xlsx without keeping the
+    whole result in memory (xlsx uses openpyxl's write-only mode).
+
+    Parquet output needs one schema for every chunk, while each chunk infers
+    its own dtypes (an all-empty chunk, or ints in one file and strings in
+    another). Pass `schema` to pin it; otherwise it is taken from the first
+    chunk with empty columns written as strings. Chunk columns that do not
+    cast to the pinned type are written as strings when the pinned type is
+    a string, and raise otherwise.
+    """
+
+    def __init__(self, output_file: Path, schema=None):
+        self.output_file = output_file
+        self.schema = schema
+        self.suffix = output_file.suffix.lower()
+        if self.suffix == ".parquet" and pyarrow is None:
+            raise ValueError("Parquet output requires pyarrow.")
+        if self.suffix not in (".parquet", ".csv", ".xlsx"):
+            raise ValueError(f"Unsupported output format: {self.suffix}")
+        self._writer = None
+        self._sheet = None
+        self.rows = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        df = df.astype({col: "object" for col in df.columns if df[col].dtype == "category"})
+        if self.suffix == ".parquet":
+            table = self._coerce(df)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.output_file, self.schema)
+            self._writer.write_table(table)
+        elif self.suffix == ".csv":
+            df.to_csv(self.output_file, mode="a" if self.rows else "w", header=not self.rows, index=False)
+        else:
+            if self._writer is None:
+                from openpyxl import Workbook
+
+                self._writer = Workbook(write_only=True)
+                self._sheet = self._writer.create_sheet()
+                self._sheet.append(list(df.columns))
+            for row in df.itertuples(index=False, name=None):
+                self._sheet.append([None if pd.isna(value) else value for value in row])
+        self.rows += len(df)
+
+    def _coerce(self, df: pd.DataFrame):
+        if self.schema is None:
+            self.schema = pyarrow.schema(
+                [(col, _arrow_column(df[col]).type) for col in df.columns]
             )
+        return pyarrow.Table.from_arrays(
+            [_arrow_column(df[field.name], field.type) for field in self.schema], schema=self.schema
         )
 
-        output_file = generate_new(input_file)
-        # Write the merged data to a new Excel file
-        merged_df.to_excel(output_file, index=False, engine="openpyxl")
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        if self.suffix == ".parquet":
+            self._writer.close()
+        else:
+            self._writer.save(self.output_file)
+
 
-        print(f"Data merged successfully. Output saved to {output_file}.")
+def _join_functions(funcs: pd.Series) -> str:
+    return "\n\n".join(f.strip() for f in funcs if isinstance(f, str) and f.strip())
 
 
-def merge_dataframes(data_frames: list[pd.DataFrame]) -> pd.DataFrame:
+def aggregate_functions(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Merge multiple DataFrames on common columns.
+    Same result as grouping by `identifier_cols` (sorted) and aggregating
+    `function` with `_join_functions`, without a Python call per group.
+
+    Distinct `function` values are stripped once; the surviving strings are
+    ordered by group id (stably, so row order within a group is kept) and
+    joined per group, with single-entry groups assigned in one step.
     """
-    with console.status("Merging files..."):
-        sleep(1.5)
-        common_columns = set.intersection(*[set(df.columns) for df in data_frames])
-        merged_df = pd.concat(
-            [df[common_columns] for df in data_frames],
-            ignore_index=True,
-            join="outer",
-        )
-        merged_df.to_excel("merged_files_js.xlsx", index=False)
+    grouped = df.groupby(identifier_cols, observed=True, sort=True, dropna=False)
+    group_ids = grouped.ngroup().to_numpy()
+    group_count = grouped.ngroups
+    _, first_rows = np.unique(group_ids, return_index=True)
+    merged = df[identifier_cols].iloc[first_rows].reset_index(drop=True)
+
+    joined = np.full(group_count, "", dtype=object)
+    # Strip each distinct value once; non-strings and blanks are dropped.
+    value_codes, uniques = pd.factorize(df["function"], use_na_sentinel=True)
+    stripped = np.array(
+        [value.strip() if isinstance(value, str) else "" for value in uniques] + [""], dtype=object
+    )
+    values = stripped[value_codes]
+    valid = values != ""
+    ids, values = group_ids[valid], values[valid]
+    order = np.argsort(ids, kind="stable")
+    ids, values = ids[order], values[order]
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else ids
+    ends = np.r_[starts[1:], len(ids)]
+    single = ends - starts == 1
+    joined[ids[starts[single]]] = values[starts[single]]
+    value_list = values.tolist()
+    for group_id, start, end in zip(ids[starts[~single]], starts[~single], ends[~single]):
+        joined[group_id] = "\n\n".join(value_list[start:end])
+    merged["function"] = joined
+    return merged
+
+
+def _merge_partition(parts: list[Path]) -> pd.DataFrame:
+    df = pd.concat([_read_part(part) for part in parts], ignore_index=True)
+    df = normalize_identifiers(df)  # categories differ per file; re-unify
+    return aggregate_functions(df)
+
+
+def _iter_sorted(frames: list[pd.DataFrame], chunk_rows: int = 50_000) -> Iterator[pd.DataFrame]:
+    """K-way merges frames that are each sorted by the identifier columns."""
+    if not frames:
+        return
+    key_count = len(identifier_cols)
+    rows = heapq.merge(
+        *(frame.itertuples(index=False, name=None) for frame in frames),
+        key=lambda row: row[:key_count],
+    )
+    chunk: list[tuple] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_rows:
+            yield pd.DataFrame(chunk, columns=frames[0].columns)
+            chunk = []
+    if chunk:
+        yield pd.DataFrame(chunk, columns=frames[0].columns)
+
+
+def merge_employee_functions(
+    input_files: Path | list[Path],
+    output_file: Optional[Path] = None,
+    partitions: int = PARTITIONS,
+    max_workers: Optional[int] = None,
+):
+    """
+    Merge employee functions from one or more Excel files.
+
+    Rows are hash-partitioned on the identifier columns into temporary
+    files, so each group lives in exactly one partition and only one
+    partition's rows are in memory while grouping. The merged rows are
+    written in identifier order to .xlsx (default), .csv or .parquet.
+    """
+    input_files = [input_files] if isinstance(input_files, Path) else list(input_files)
+    output_file = output_file or generate_new(input_files[0])
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        part_dir = Path(tmp_dir)
+        with timer.stage(f"Reading {len(input_files)} workbook(s)"):
+            summaries = partition_workbooks(
+                input_files, part_dir, partitions, [*identifier_cols, "function"], max_workers
+            )
+        with timer.stage("Grouping"):
+            merged_parts = []
+            for bucket in range(partitions):
+                parts = sorted(part_dir.glob(f"{bucket:03d}-*"))
+                if parts:
+                    merged_parts.append(_merge_partition(parts))
+        with timer.stage("Writing"):
+            # Identifier labels and joined functions are always strings.
+            schema = (
+                pyarrow.schema([(col, pyarrow.string()) for col in [*identifier_cols, "function"]])
+                if pyarrow is not None
+                else None
+            )
+            writer = TableWriter(output_file, schema)
+            for chunk in _iter_sorted(merged_parts):
+                writer.write(chunk)
+            writer.close()
+
+    row_count = sum(rows for _, rows, _ in summaries)
+    print(f"Data merged successfully ({row_count} rows -> {writer.rows}). Output saved to {output_file}.")
+    timer.report()
+
+
+def merge_dataframes(
+    input_files: list[Path],
+    output_file: Path = Path("merged_files_js.xlsx"),
+    max_workers: Optional[int] = None,
+) -> TableWriter:
+    """
+    Merge multiple workbooks on their common columns.
+
+    Workbooks are read concurrently into temporary parts; only the common
+    columns are then read back, one part at a time, and appended to the
+    output (.xlsx, .csv or .parquet).
+    """
+    timer = StageTimer()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        part_dir = Path(tmp_dir)
+        with timer.stage(f"Reading {len(input_files)} workbook(s)"):
+            # Plain concat: values are written as read, without identifier normalization.
+            summaries = partition_workbooks(
+                input_files, part_dir, 1, max_workers=max_workers, normalize=False
+            )
+        common_columns = [
+            col
+            for col in summaries[0][2]
+            if all(col in columns for _, _, columns in summaries[1:])
+        ]
+        with timer.stage("Merging files"):
+            part_paths = [
+                next(part_dir.glob(f"{_part_path(part_dir, 0, idx).stem}.*"))
+                for idx in range(len(input_files))
+            ]
+            schema = (
+                unified_schema(part_paths, common_columns)
+                if output_file.suffix.lower() == ".parquet" and pyarrow is not None
+                else None
+            )
+            writer = TableWriter(output_file, schema)
+            for part_path in part_paths:
+                writer.write(_read_part(part_path, common_columns))
+            writer.close()
     console.print("\n\n[green]All files merged successfully.[/green]")
+    timer.report()
+    return writer
 
 
 def main():
@@ -77,23 +451,15 @@ def main():
         console.print("\n\n[]Update identifier_cols\n\n")
         exit()
     try:
-        data_frames: list[pd.DataFrame] = []
-        all_processed: bool = True
         folder: Path = Path(None)
-        for path in folder.iterdir():
-            if path.is_file() and path.suffix == ".xlsx":
-                try:
-                    console.print(
-                        f"\n\n[dark_slate_gray2]File: {path.name}[/dark_slate_gray2]"
-                    )
-
-                except Exception as e:
-                    console.print(f"\n[orange1]Error:\n{e}[/orange1]")
-                    all_processed = False
-                    sleep(5)
-
-        if all_processed and data_frames:
-            merge_dataframes(data_frames)
+        input_files: list[Path] = sorted(
+            path for path in folder.iterdir() if path.is_file() and path.suffix == ".xlsx"
+        )
+        for path in input_files:
+            console.print(f"\n\n[dark_slate_gray2]File: {path.name}[/dark_slate_gray2]")
+
+        if input_files:
+            merge_dataframes(input_files)
     except Exception as e:
         console.print(f"\n[orange1]Error:[/orange1]\n{e}")
         sleep(5)
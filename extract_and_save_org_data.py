@@ -1,4 +1,7 @@
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
 
 import fitz
 
@@ -6,86 +9,116 @@ PDF_PATH: str
 JSON_PATH: str
 
 
-def extract_org_codes_and_symbols_from_pdf(file_path: str = PDF_PATH) -> list[str]:
+def _page_lines(page) -> list[str]:
+    return [line.strip() for line in str(page.get_text()).split("\n")]
+
+
+def iter_pdf_lines(file_path: str) -> Iterator[str]:
     with fitz.open(file_path) as pdf_document:
-        extracted_text_data = [
-            line.strip()
-            for page in pdf_document
-            for line in str(page.get_text()).split("\n")
-        ]
-        return extracted_text_data
+        for page in pdf_document:
+            yield from _page_lines(page)
+
+
+def match_org_window(window: deque[str]) -> dict | None:
+    """
+    Matches a 4-line window against the default, then the alternate format.
+    Default: symbol / "<10-char code> <title>" / "<10-char code> ...".
+    Alternate: <10-char code> / title / symbol / <10-char code>.
+    """
+    first, second, third, fourth = window
+    primary_code, _, org_title = second.partition(" ")
+    if len(primary_code) == 10 and org_title and len(third.split(" ")[0]) == 10:
+        return {"symbol": first, "code": primary_code, "title": org_title}
+    if len(first) == 10 and second and len(fourth) == 10:
+        return {"symbol": third, "code": first, "title": second}
+    return None
+
+
+def iter_org_records(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Streams org records from lines using a sliding 4-line window.
+
+    A window is only evaluated once the line after it arrives, matching the
+    original batch scan, which never evaluated the final window.
+    """
+    window: deque[str] = deque(maxlen=4)
+    has_text = False
+    for line in lines:
+        has_text = True
+        if len(window) == 4:
+            org_details = match_org_window(window)
+            if org_details:
+                yield org_details
+        window.append(line)
+    if not has_text:
+        raise ValueError("No text provided.")
 
 
-def validate_org_details(primary_code: str, secondary_code: str, org_title) -> bool:
-    return all([org_title != "", len(primary_code) == 10, len(secondary_code) == 10])
+def collect_valid_org_info(extracted_text_data: list[str]) -> list[dict]:
+    return list(iter_org_records(extracted_text_data))
 
 
-def extract_org_details_from_default_format(
-    extracted_text_data: list[str],
-) -> dict | None:
-    try:
-        org_symbol = extracted_text_data[0]
-        primary_code, *org_title = extracted_text_data[1].split(" ", 1)
-        org_title = " ".join(org_title)
-        secondary_code = extracted_text_data[2].split(" ")[0]
-        return {
-            "primary_code": primary_code,
-            "symbol": org_symbol,
-            "title": org_title,
-            "secondary_code": secondary_code,
-        }
-    except IndexError as e:
-        print(f"Insufficient data for extraction (default format): {e}")
-        return None
-
-
-def extract_org_info_from_alternate_format(
-    extracted_text_data: list[str],
-) -> dict | None:
-    try:
-        primary_code = extracted_text_data[0]
-        org_title = extracted_text_data[1]
-        org_symbol = extracted_text_data[2]
-        secondary_code = extracted_text_data[3]
-        return {
-            "primary_code": primary_code,
-            "symbol": org_symbol,
-            "title": org_title,
-            "secondary_code": secondary_code,
-        }
-    except IndexError as e:
-        print(f"Insufficient data for extraction (alternate format): {e}")
-        return None
+def dedup_by_code(org_details: Iterable[dict]) -> list[dict]:
+    """Keeps the first record for each code, in page order."""
+    unique: dict[str, dict] = {}
+    for org in org_details:
+        unique.setdefault(org["code"], org)
+    return list(unique.values())
 
 
-def collect_valid_org_info(extracted_text_data: list[str]) -> list[dict]:
-    if not extracted_text_data:
+def _collect_page_range(file_path: str, start_page: int, end_page: int) -> list[dict]:
+    """
+    Worker: records whose 4-line window starts on pages [start_page, end_page).
+    Up to 4 lines of the following pages are read so windows straddling the
+    range boundary are matched exactly as in a serial scan.
+    """
+    with fitz.open(file_path) as pdf_document:
+        lines = [
+            line
+            for page_number in range(start_page, end_page)
+            for line in _page_lines(pdf_document[page_number])
+        ]
+        lookahead: list[str] = []
+        page_number = end_page
+        while len(lookahead) < 4 and page_number < pdf_document.page_count:
+            lookahead.extend(_page_lines(pdf_document[page_number]))
+            page_number += 1
+    if not lines:
+        return []
+    return list(iter_org_records(lines + lookahead[:4]))
+
+
+def extract_org_records_parallel(
+    file_path: str, workers: int = 4, pages_per_task: int | None = None
+) -> list[dict]:
+    """
+    Splits the PDF into page ranges processed in a process pool (each worker
+    opens its own document) and concatenates the records in page order
+    before `dedup_by_code`, so the result is the same list the serial path
+    yields.
+    """
+    with fitz.open(file_path) as pdf_document:
+        page_count = pdf_document.page_count
+    if not page_count:
         raise ValueError("No text provided.")
-
-    valid_org_details = []
-    for block_index in range(0, len(extracted_text_data) - 4):
-        block = extracted_text_data[block_index : block_index + 4]
-
-        for extractor in [
-            extract_org_details_from_default_format,
-            extract_org_info_from_alternate_format,
-        ]:
-            org_details = extractor(block)
-            is_valid_org = validate_org_details(
-                org_details["primary_code"],
-                org_details["secondary_code"],
-                org_details["title"],
-            )
-            if org_details and is_valid_org:
-                valid_org_details.append(
-                    {
-                        "symbol": org_details["symbol"],
-                        "code": org_details["primary_code"],
-                        "title": org_details["title"],
-                    }
+    pages_per_task = pages_per_task or max(1, -(-page_count // (workers * 4)))
+    ranges = [
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    ]
+    if workers <= 1:
+        results = [_collect_page_range(file_path, *page_range) for page_range in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    _collect_page_range,
+                    [file_path] * len(ranges),
+                    [start for start, _ in ranges],
+                    [end for _, end in ranges],
                 )
-                break
-    return valid_org_details
+            )
+    return dedup_by_code(org for records in results for org in records)
 
 
 def save_as_json(org_details: list[dict]) -> None:
@@ -94,10 +127,12 @@ def save_as_json(org_details: list[dict]) -> None:
         print("saved org info to file.")
 
 
-def extract_and_save_org_data():
+def extract_and_save_org_data(workers: int = 1):
     try:
-        extracted_text_data = extract_org_codes_and_symbols_from_pdf()
-        org_details = collect_valid_org_info(extracted_text_data)
+        if workers > 1:
+            org_details = extract_org_records_parallel(PDF_PATH, workers)
+        else:
+            org_details = dedup_by_code(iter_org_records(iter_pdf_lines(PDF_PATH)))
         save_as_json(org_details)
     except Exception as e:
         print(e)
@@ -0,0 +1,197 @@
+import hashlib
+import pickle
+import sqlite3
+from pathlib import Path
+from time import time
+from typing import Any, Callable, Optional
+
+from awards.formatting import FORMATTER_VERSION
+
+DEFAULT_CACHE_PATH: Path = Path.home() / ".award_cache" / "extraction_cache.sqlite3"
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+# Bump when the table layout or payload encoding changes; older caches are dropped.
+SCHEMA_VERSION: int = 3
+
+
+class ExtractionCache:
+    """
+    Persistent cache of cleaned PDF extraction results.
+
+    Entries are keyed by the file's SHA-256 content hash, a namespace (which
+    extractor produced the payload) and the formatter version, so renamed or
+    moved files still hit and a formatter change invalidates everything.
+    Payloads are pickled, so dict keys keep their types (None, ints) on a hit.
+    Total payload size is bounded; the least recently used entries are evicted.
+    The running total lives in a one-row `cache_size` table that triggers keep
+    in step with every insert, update and delete, in the same transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        version: str = FORMATTER_VERSION,
+    ):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits: int = 0
+        self.misses: int = 0
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict:
+        # Connections cannot cross process boundaries; workers reconnect lazily.
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.db_path, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            with self._connection as conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS entries")
+                    conn.execute("DROP TABLE IF EXISTS cache_size")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS entries (
+                        digest    TEXT NOT NULL,
+                        namespace TEXT NOT NULL,
+                        version   TEXT NOT NULL,
+                        payload   BLOB NOT NULL,
+                        size      INTEGER NOT NULL,
+                        last_used REAL NOT NULL,
+                        PRIMARY KEY (digest, namespace, version)
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+                )
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS cache_size (
+                        id    INTEGER PRIMARY KEY CHECK (id = 0),
+                        bytes INTEGER NOT NULL
+                    )
+                    """
+                )
+                conn.execute("INSERT OR IGNORE INTO cache_size VALUES (0, 0)")
+                for name, event, change in (
+                    ("insert", "INSERT", "NEW.size"),
+                    ("update", "UPDATE OF size", "NEW.size - OLD.size"),
+                    ("delete", "DELETE", "-OLD.size"),
+                ):
+                    conn.execute(
+                        f"CREATE TRIGGER IF NOT EXISTS entries_size_{name} AFTER {event} ON entries "
+                        f"BEGIN UPDATE cache_size SET bytes = bytes + {change}; END"
+                    )
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return self._connection
+
+    @staticmethod
+    def content_hash(file_path: Path | str) -> str:
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def get(self, digest: str, namespace: str) -> Optional[Any]:
+        with self._conn as conn:
+            row = conn.execute(
+                "SELECT payload FROM entries WHERE digest = ? AND namespace = ? AND version = ?",
+                (digest, namespace, self.version),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE entries SET last_used = ? WHERE digest = ? AND namespace = ? AND version = ?",
+                (time(), digest, namespace, self.version),
+            )
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, digest: str, namespace: str, payload: Any) -> None:
+        serialized = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._conn as conn:
+            # An upsert, not INSERT OR REPLACE: REPLACE's implicit delete skips
+            # the size triggers.
+            conn.execute(
+                """
+                INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (digest, namespace, version) DO UPDATE SET
+                    payload = excluded.payload,
+                    size = excluded.size,
+                    last_used = excluded.last_used
+                """,
+                (digest, namespace, self.version, serialized, len(serialized), time()),
+            )
+            total = conn.execute("SELECT bytes FROM cache_size").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total)
+
+    def cached(
+        self, file_path: Path | str, namespace: str, compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns the cached payload for the file, computing and storing it on a miss.
+        """
+        digest = self.content_hash(file_path)
+        payload = self.get(digest, namespace)
+        if payload is None:
+            payload = compute()
+            self.put(digest, namespace, payload)
+        return payload
+
+    def _evict(self, conn: sqlite3.Connection, total: int) -> None:
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT rowid, size FROM entries ORDER BY last_used LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for rowid, size in rows:
+                evicted.append((rowid,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            conn.executemany("DELETE FROM entries WHERE rowid = ?", evicted)
+
+    def invalidate(
+        self, file_path: Optional[Path | str] = None, namespace: Optional[str] = None
+    ) -> int:
+        """
+        Removes entries for a file and/or namespace. Returns the number removed.
+        """
+        clauses, params = [], []
+        if file_path is not None:
+            clauses.append("digest = ?")
+            params.append(self.content_hash(file_path))
+        if namespace is not None:
+            clauses.append("namespace = ?")
+            params.append(namespace)
+        if not clauses:
+            raise ValueError("Specify a file path and/or namespace (or use clear()).")
+        with self._conn as conn:
+            return conn.execute(
+                f"DELETE FROM entries WHERE {' AND '.join(clauses)}", params
+            ).rowcount
+
+    def purge_stale_versions(self) -> int:
+        """Removes entries written by other formatter versions."""
+        with self._conn as conn:
+            return conn.execute(
+                "DELETE FROM entries WHERE version != ?", (self.version,)
+            ).rowcount
+
+    def clear(self) -> None:
+        with self._conn as conn:
+            conn.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,13 +1,22 @@
 import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ALPHANUMERIC_PATTERN = re.compile(r"[A-Za-z0-9]+")
+
 
 class Hash:
     @staticmethod
     def _normalize(key: str) -> str:
         if not isinstance(key, str):
             return key
-        lowered = key.lower()
-        pattern = r"[A-Za-z0-9]+"
-        match = re.findall(pattern, lowered)
+        match = ALPHANUMERIC_PATTERN.findall(key.lower())
         if not match:
             return "."
         return "".join(match)
@@ -48,3 +57,69 @@ class Hash:
             return Hash.derive_key(hashes)
         except Exception as e:
             print(f"An error occurred: {e}")
+
+    @staticmethod
+    def _hash_rows(rows: Sequence[tuple]) -> list[Optional[str]]:
+        """
+        Same result as `create_hash` per row, with the helpers inlined; rows
+        that `create_hash` would reject yield None.
+        """
+        sha256 = hashlib.sha256
+        findall = ALPHANUMERIC_PATTERN.findall
+        keys: list[Optional[str]] = []
+        for row in rows:
+            hashes = []
+            for value in row:
+                if not value:
+                    continue
+                if isinstance(value, str):
+                    value = "".join(findall(value.lower())) or "."
+                hashes.append(sha256(str(value).encode()).hexdigest())
+            count = len(hashes)
+            if count == 1:
+                keys.append(hashes[0][:32])
+            elif 1 < count <= 6:
+                width = (32 // count) + 1
+                keys.append("".join(digest[:width] for digest in hashes)[:32])
+            else:
+                keys.append(None)
+        return keys
+
+    @staticmethod
+    def create_hashes(
+        *columns: Iterable[str],
+        max_workers: Optional[int] = None,
+        chunk_size: int = 10_000,
+    ):
+        """
+        Derives one key per row from equally long input columns (lists,
+        tuples or pandas Series), byte-for-byte identical to calling
+        `create_hash(*row)` on each row.
+
+        Rows are hashed in chunks on a thread pool; hashlib only releases the
+        GIL for inputs over 2 KiB, so expect gains for long inputs only. The
+        keys come back as a NumPy array when NumPy is available (None for
+        invalid rows), otherwise as a list.
+        """
+        columns = [list(column) for column in columns]
+        if not columns:
+            raise ValueError("At least one input column is required")
+        row_count = len(columns[0])
+        if any(len(column) != row_count for column in columns):
+            raise ValueError("All input columns must have the same length")
+
+        rows = list(zip(*columns))
+        chunks = [rows[i : i + chunk_size] for i in range(0, row_count, chunk_size)]
+        if max_workers == 1 or len(chunks) <= 1:
+            results = [Hash._hash_rows(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(Hash._hash_rows, chunks))
+        keys = [key for chunk in results for key in chunk]
+
+        failed = keys.count(None)
+        if failed:
+            print(f"{failed} of {row_count} rows had no usable inputs or more than 6.")
+        if np is not None:
+            return np.array(keys, dtype=object)
+        return keys
@@ -1,27 +1,49 @@
 import pandas as pd
+import csv
 import json
+import pickle
 import sys
+from array import array
 from collections import defaultdict
+from pathlib import Path
 
-def read_excel(file_path):
+from columnar_cache import ColumnarCache
+
+REQUIRED_COLUMNS = ('Employee', 'Supervisor', 'Official')
+
+def read_excel(file_path, columns=REQUIRED_COLUMNS, cache=None):
     """
     Reads the Excel file and returns a pandas DataFrame.
     
+    The workbook is parsed once and kept as a columnar sidecar (see
+    `ColumnarCache`); later reads of the unchanged file only load `columns`.
+    
     Args:
         file_path (str): Path to the Excel file.
+        columns (tuple): Columns to load (None for all). The required columns are always loaded.
+        cache (ColumnarCache): Sidecar cache to use (default location if None).
         
     Returns:
         pd.DataFrame: DataFrame containing the Excel data.
     """
     try:
-        df = pd.read_excel(file_path, dtype=str)  # Read all data as strings to avoid issues
+        cache = cache or ColumnarCache()
+        if columns is not None:
+            columns = list(dict.fromkeys(REQUIRED_COLUMNS + tuple(columns)))
+        # Read all data as strings to avoid issues
+        df = cache.load(
+            file_path,
+            lambda path: pd.read_excel(path, dtype=str),
+            columns=columns,
+            variant='dtype=str',
+        )
         # Ensure required columns are present
-        required_columns = {'Employee', 'Supervisor', 'Official'}
+        required_columns = set(REQUIRED_COLUMNS)
         if not required_columns.issubset(df.columns):
             missing = required_columns - set(df.columns)
             raise ValueError(f"Missing columns in Excel file: {', '.join(missing)}")
         # Fill NaN with None for easier handling
-        df = df.where(pd.notnull(df), None)
+        df = df.astype(object).where(pd.notnull(df), None)
         return df
     except Exception as e:
         print(f"Error reading Excel file: {e}")
@@ -37,33 +59,162 @@ def detect_cycles(df):
     Raises:
         ValueError: If a cycle is detected in the supervisory relationships.
     """
-    # Build a graph where each node is a supervisor or employee
-    graph = defaultdict(list)
-    for _, row in df.iterrows():
-        employee = row['Employee']
-        supervisor = row['Supervisor']
-        if supervisor:
-            graph[supervisor].append(employee)
-    
-    visited = set()
-    rec_stack = set()
-    
-    def dfs(node):
-        visited.add(node)
-        rec_stack.add(node)
-        for neighbour in graph.get(node, []):
-            if neighbour not in visited:
-                if dfs(neighbour):
-                    return True
-            elif neighbour in rec_stack:
-                return True
-        rec_stack.remove(node)
-        return False
-    
-    for node in graph:
-        if node not in visited:
-            if dfs(node):
-                raise ValueError("Cycle detected in supervisory relationships.")
+    edges = (
+        (row['Supervisor'], row['Employee'])
+        for _, row in df.iterrows()
+        if row['Supervisor']
+    )
+    detect_cycles_in_edges(edges)
+
+def detect_cycles_in_edges(edges):
+    """
+    Detects cycles in (supervisor, employee) edges.
+    
+    Args:
+        edges (iterable): Pairs of (supervisor, employee) names.
+        
+    Raises:
+        ValueError: If a cycle is detected, listing every cycle's members.
+    """
+    cycles = find_cycles_in_edges(edges)
+    if cycles:
+        raise ValueError(format_cycles(cycles))
+
+def find_cycles_in_edges(edges):
+    """
+    Finds every cycle in (supervisor, employee) name pairs.
+    
+    Args:
+        edges (iterable): Pairs of (supervisor, employee) names.
+        
+    Returns:
+        list: One sorted list of names per strongly connected component that
+        contains a cycle.
+    """
+    names, index = [], {}
+    sources, destinations = array('l'), array('l')
+    for supervisor, employee in edges:
+        for name in (supervisor, employee):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+        sources.append(index[supervisor])
+        destinations.append(index[employee])
+
+    offsets = array('l', [0]) * (len(names) + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for node in range(len(names)):
+        offsets[node + 1] += offsets[node]
+    targets = array('l', [0]) * len(sources)
+    cursor = array('l', offsets)
+    for source, destination in zip(sources, destinations):
+        targets[cursor[source]] = destination
+        cursor[source] += 1
+
+    return [
+        sorted(names[node] for node in component)
+        for component in find_cycles(len(names), offsets, targets)
+    ]
+
+def find_cycles(node_count, offsets, targets):
+    """
+    Iterative Tarjan strongly-connected-components search in O(V+E).
+    
+    Uses an explicit work stack, so chain depth is not bounded by the
+    recursion limit.
+    
+    Args:
+        node_count (int): Number of nodes, IDs 0..node_count-1.
+        offsets (array): CSR offsets; edges of node n are targets[offsets[n]:offsets[n + 1]].
+        targets (array): CSR edge targets.
+        
+    Returns:
+        list: Node-ID lists, one per component with more than one node or a self-loop.
+    """
+    unvisited = -1
+    order = array('l', [unvisited]) * node_count
+    lowlink = array('l', [0]) * node_count
+    on_stack = bytearray(node_count)
+    stack = []
+    cycles = []
+    counter = 0
+
+    for root in range(node_count):
+        if order[root] != unvisited:
+            continue
+        order[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [[root, offsets[root]]]
+        while work:
+            frame = work[-1]
+            node, edge = frame
+            if edge < offsets[node + 1]:
+                frame[1] = edge + 1
+                child = targets[edge]
+                if order[child] == unvisited:
+                    order[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = 1
+                    work.append([child, offsets[child]])
+                elif on_stack[child] and order[child] < lowlink[node]:
+                    lowlink[node] = order[child]
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] != order[node]:
+                continue
+            component = []
+            while True:
+                member = stack.pop()
+                on_stack[member] = 0
+                component.append(member)
+                if member == node:
+                    break
+            is_self_loop = node in targets[offsets[node]:offsets[node + 1]]
+            if len(component) > 1 or is_self_loop:
+                cycles.append(component)
+    return cycles
+
+def format_cycles(cycles):
+    """
+    Formats cycles for error messages.
+    
+    Args:
+        cycles (list): Lists of employee names, one per cycle.
+        
+    Returns:
+        str: Human readable description of every cycle.
+    """
+    details = "\n".join(
+        f"  {idx}. {' <-> '.join(cycle)}" for idx, cycle in enumerate(cycles, start=1)
+    )
+    return f"{len(cycles)} cycle(s) detected in supervisory relationships:\n{details}"
+
+def validate_hierarchy(file_path):
+    """
+    Standalone validator: streams a roster and reports every supervisory cycle.
+    
+    Args:
+        file_path (str): Path to the roster file (.xlsx, .csv or .parquet).
+        
+    Returns:
+        list: Cycles found (empty when the roster is valid).
+    """
+    graph = HierarchyGraph.from_file(file_path)
+    cycles = graph.find_cycles()
+    if cycles:
+        print(format_cycles(cycles))
+    else:
+        print(f"No cycles found in '{file_path}'.")
+    return cycles
 
 def build_hierarchy(df):
     """
@@ -128,6 +279,460 @@ def build_hierarchy(df):
     
     return hierarchy
 
+def _clean_cell(value):
+    """
+    Normalizes a cell value the way `read_excel` does: blanks become None.
+    """
+    if value is None:
+        return None
+    value = str(value)
+    return value if value.strip() else None
+
+def iter_row_chunks(file_path, chunk_size=10_000, optional_columns=()):
+    """
+    Streams (employee, supervisor, official) rows without loading the whole file.
+    
+    Supports .xlsx (openpyxl read-only mode), .csv and .parquet (pyarrow) input.
+    
+    Args:
+        file_path (str): Path to the roster file.
+        chunk_size (int): Number of rows per yielded chunk.
+        optional_columns (tuple): Extra columns appended to each row (None if absent).
+        
+    Yields:
+        list: Chunks of (employee, supervisor, official, *optional) tuples.
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix == '.parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file_path)
+        available = set(parquet_file.schema_arrow.names)
+        missing = set(REQUIRED_COLUMNS) - available
+        if missing:
+            raise ValueError(f"Missing columns in parquet file: {', '.join(missing)}")
+        columns = list(REQUIRED_COLUMNS) + [name for name in optional_columns if name in available]
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            values = {name: batch.column(name).to_pylist() for name in columns}
+            empty = [None] * batch.num_rows
+            yield [
+                tuple(_clean_cell(value) for value in row)
+                for row in zip(*(values.get(name, empty) for name in REQUIRED_COLUMNS + tuple(optional_columns)))
+            ]
+        return
+
+    if suffix == '.csv':
+        f = open(file_path, newline='', encoding='utf-8')
+        rows = csv.reader(f)
+    else:
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    try:
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows, [])]
+        missing = set(REQUIRED_COLUMNS) - set(header)
+        if missing:
+            raise ValueError(f"Missing columns in {suffix.lstrip('.')} file: {', '.join(missing)}")
+        positions = [
+            header.index(name) if name in header else None
+            for name in REQUIRED_COLUMNS + tuple(optional_columns)
+        ]
+        chunk = []
+        for row in rows:
+            chunk.append(tuple(
+                _clean_cell(row[position]) if position is not None and position < len(row) else None
+                for position in positions
+            ))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        if suffix == '.csv':
+            f.close()
+        else:
+            workbook.close()
+
+class HierarchyGraph:
+    """
+    Supervisor graph keyed by integer node IDs.
+    
+    Each employee row stores its supervisor and official as node indexes in
+    compact arrays (-1 when missing); a later row for the same employee
+    replaces the earlier one, which is what makes incremental diffs possible.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.supervisor_of = array('l')
+        self.official_of = array('l')
+        self.has_row = bytearray()
+
+    def _node(self, name):
+        if name is None:
+            return -1
+        node = self.index.get(name)
+        if node is None:
+            node = len(self.names)
+            self.index[name] = node
+            self.names.append(name)
+            self.supervisor_of.append(-1)
+            self.official_of.append(-1)
+            self.has_row.append(0)
+        return node
+
+    def add_rows(self, rows):
+        """
+        Inserts or replaces employee rows.
+        
+        Args:
+            rows (iterable): (employee, supervisor, official) tuples.
+        """
+        for employee, supervisor, official in rows:
+            node = self._node(employee)
+            if node == -1:
+                continue
+            self.supervisor_of[node] = self._node(supervisor)
+            self.official_of[node] = self._node(official)
+            self.has_row[node] = 1
+
+    def remove_employees(self, employees):
+        """
+        Removes employee rows; names stay interned so node IDs remain stable.
+        
+        Args:
+            employees (iterable): Employee names to remove.
+        """
+        for employee in employees:
+            node = self.index.get(employee)
+            if node is not None:
+                self.supervisor_of[node] = -1
+                self.official_of[node] = -1
+                self.has_row[node] = 0
+
+    def apply_diff(self, rows, removed=()):
+        """
+        Applies changed rows and removals to an existing graph.
+        
+        Args:
+            rows (iterable): Changed or new (employee, supervisor, official) tuples.
+            removed (iterable): Employee names that left the roster.
+        """
+        self.remove_employees(removed)
+        self.add_rows(rows)
+
+    @classmethod
+    def from_file(cls, file_path, chunk_size=10_000):
+        """
+        Builds the graph in a single streaming pass over a roster file.
+        """
+        graph = cls()
+        for chunk in iter_row_chunks(file_path, chunk_size):
+            graph.add_rows(chunk)
+        return graph
+
+    def rows(self):
+        """
+        Yields (employee, supervisor, official) node IDs for every employee row.
+        """
+        for node in range(len(self.names)):
+            if self.has_row[node]:
+                yield node, self.supervisor_of[node], self.official_of[node]
+
+    def adjacency(self):
+        """
+        Builds supervisor -> reports adjacency in compressed sparse row form.
+        
+        Returns:
+            tuple: (offsets, targets) arrays; the reports of node `n` are
+            `targets[offsets[n]:offsets[n + 1]]`.
+        """
+        node_count = len(self.names)
+        offsets = array('l', [0]) * (node_count + 1)
+        for employee, supervisor, _ in self.rows():
+            if supervisor != -1:
+                offsets[supervisor + 1] += 1
+        for node in range(node_count):
+            offsets[node + 1] += offsets[node]
+        targets = array('l', [0]) * offsets[node_count]
+        cursor = array('l', offsets)
+        for employee, supervisor, _ in self.rows():
+            if supervisor != -1:
+                targets[cursor[supervisor]] = employee
+                cursor[supervisor] += 1
+        return offsets, targets
+
+    def find_cycles(self):
+        """
+        Returns every supervisory cycle as a sorted list of employee names.
+        """
+        offsets, targets = self.adjacency()
+        return [
+            sorted(self.names[node] for node in component)
+            for component in find_cycles(len(self.names), offsets, targets)
+        ]
+
+    def to_tree(self):
+        """
+        Builds the queryable arbitrary-depth `OrgTree` for this graph.
+        """
+        return OrgTree(self)
+
+    def edges(self):
+        """
+        Yields (supervisor, employee) name pairs.
+        """
+        for employee, supervisor, _ in self.rows():
+            if supervisor != -1:
+                yield self.names[supervisor], self.names[employee]
+
+    def to_hierarchy(self):
+        """
+        Builds the same Official -> Supervisor -> Employee structure as `build_hierarchy`.
+        
+        Returns:
+            list: List of hierarchical structures representing Officials.
+        """
+        names = self.names
+        official_to_supervisors = defaultdict(set)
+        supervisor_to_employees = defaultdict(set)
+        officials = set()
+        for employee, supervisor, official in self.rows():
+            if official != -1:
+                officials.add(official)
+                if supervisor != -1:
+                    official_to_supervisors[official].add(supervisor)
+            if supervisor != -1:
+                supervisor_to_employees[supervisor].add(employee)
+            else:
+                print(f"Warning: Supervisor missing for employee '{names[employee]}'.")
+
+        hierarchy = []
+        for official in sorted(officials, key=names.__getitem__):
+            supervisors = official_to_supervisors.get(official, set())
+            if not supervisors:
+                print(f"Warning: No supervisors found under official '{names[official]}'.")
+            supervisor_nodes = []
+            for supervisor in sorted(supervisors, key=names.__getitem__):
+                employees = supervisor_to_employees.get(supervisor, set())
+                if not employees:
+                    print(f"Warning: No employees found under supervisor '{names[supervisor]}'.")
+                supervisor_nodes.append({
+                    "name": names[supervisor],
+                    "Employees": [
+                        {"name": names[employee]}
+                        for employee in sorted(employees, key=names.__getitem__)
+                    ]
+                })
+            hierarchy.append({"name": names[official], "Supervisors": supervisor_nodes})
+        return hierarchy
+
+    def save_state(self, state_path):
+        """
+        Persists the graph so the next run can apply a diff instead of rebuilding.
+        """
+        with open(state_path, 'wb') as f:
+            pickle.dump(
+                (self.names, self.supervisor_of, self.official_of, self.has_row),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+
+    @classmethod
+    def load_state(cls, state_path):
+        graph = cls()
+        with open(state_path, 'rb') as f:
+            graph.names, graph.supervisor_of, graph.official_of, graph.has_row = pickle.load(f)
+        graph.index = {name: node for node, name in enumerate(graph.names)}
+        return graph
+
+class OrgTree:
+    """
+    Arbitrary-depth org tree with Euler-tour (interval) indexing.
+    
+    Each node's parent is its supervisor, or its official when the row has no
+    supervisor. A preorder walk assigns every node an interval [tin, tout) so
+    that its reports are exactly `order[tin + 1:tout]`; this gives O(1)
+    headcount and "is X under Y" checks, O(k) report listing and O(log n)
+    ancestor-at-level lookups via lazily built jump tables.
+    """
+
+    def __init__(self, graph):
+        cycles = graph.find_cycles()
+        if cycles:
+            raise ValueError(format_cycles(cycles))
+
+        self.graph = graph
+        self.names = graph.names
+        self.index = graph.index
+        node_count = len(self.names)
+        self.parent = array('l', [-1]) * node_count
+        # Interned names stay after removals; only employees with a row and
+        # the supervisors/officials a row names are part of the tree.
+        self.live = bytearray(node_count)
+        for employee, supervisor, official in graph.rows():
+            self.live[employee] = 1
+            if supervisor != -1:
+                self.live[supervisor] = 1
+            if official != -1:
+                self.live[official] = 1
+            if supervisor != -1:
+                self.parent[employee] = supervisor
+            elif official != -1 and official != employee:
+                self.parent[employee] = official
+        self._reject_official_cycles()
+
+        children = defaultdict(list)
+        for node in range(node_count):
+            if self.live[node]:
+                children[self.parent[node]].append(node)
+        for members in children.values():
+            members.sort(key=self.names.__getitem__)
+
+        self.children = children
+        self.roots = children.get(-1, [])
+        self.order = array('l')
+        self.tin = array('l', [0]) * node_count
+        self.tout = array('l', [0]) * node_count
+        self.depth = array('l', [0]) * node_count
+        stack = [(root, False) for root in reversed(self.roots)]
+        while stack:
+            node, exiting = stack.pop()
+            if exiting:
+                self.tout[node] = len(self.order)
+                continue
+            self.tin[node] = len(self.order)
+            self.order.append(node)
+            parent = self.parent[node]
+            self.depth[node] = self.depth[parent] + 1 if parent != -1 else 0
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children.get(node, ())))
+        self._jumps = None
+
+    def _reject_official_cycles(self):
+        # Falling back to the official can close a loop the supervisor graph
+        # did not have (e.g. an official whose own supervisor reports to them).
+        state = bytearray(len(self.parent))
+        for start in range(len(self.parent)):
+            path = []
+            node = start
+            while node != -1 and state[node] == 0:
+                state[node] = 1
+                path.append(node)
+                node = self.parent[node]
+            if node != -1 and state[node] == 1:
+                cycle = sorted(self.names[member] for member in path[path.index(node):])
+                raise ValueError(format_cycles([cycle]))
+            for member in path:
+                state[member] = 2
+
+    def _node(self, name):
+        node = self.index.get(name)
+        if node is None or not self.live[node]:
+            raise KeyError(f"Unknown employee: '{name}'")
+        return node
+
+    def headcount(self, name):
+        """
+        Number of direct and indirect reports under `name`.
+        """
+        node = self._node(name)
+        return self.tout[node] - self.tin[node] - 1
+
+    def reports(self, name):
+        """
+        All direct and indirect reports under `name`, in preorder.
+        """
+        node = self._node(name)
+        return [self.names[member] for member in self.order[self.tin[node] + 1:self.tout[node]]]
+
+    def direct_reports(self, name):
+        return [self.names[member] for member in self.children.get(self._node(name), ())]
+
+    def is_under(self, name, manager):
+        """
+        True if `name` reports (directly or indirectly) to `manager`.
+        """
+        node, ancestor = self._node(name), self._node(manager)
+        return self.tin[ancestor] < self.tin[node] < self.tout[ancestor]
+
+    def chain_of_command(self, name):
+        """
+        Managers of `name` from the immediate supervisor up to the root.
+        """
+        chain = []
+        node = self.parent[self._node(name)]
+        while node != -1:
+            chain.append(self.names[node])
+            node = self.parent[node]
+        return chain
+
+    def ancestor(self, name, levels_up):
+        """
+        The manager `levels_up` levels above `name` (None past the root), in O(log n).
+        """
+        node = self._node(name)
+        if levels_up > self.depth[node]:
+            return None
+        if self._jumps is None:
+            self._build_jumps()
+        level = 0
+        while levels_up:
+            if levels_up & 1:
+                node = self._jumps[level][node]
+            levels_up >>= 1
+            level += 1
+        return self.names[node]
+
+    def _build_jumps(self):
+        max_depth = max(self.depth, default=0)
+        self._jumps = [self.parent]
+        while (1 << len(self._jumps)) <= max_depth:
+            previous = self._jumps[-1]
+            self._jumps.append(array('l', (
+                previous[previous[node]] if previous[node] != -1 else -1
+                for node in range(len(previous))
+            )))
+
+    def to_nested(self):
+        """
+        Serializes the full tree as nested {"name", "Reports"} dicts of arbitrary depth.
+        """
+        nodes = {}
+        tree = []
+        for node in self.order:
+            entry = {"name": self.names[node], "Reports": []}
+            nodes[node] = entry
+            parent = self.parent[node]
+            (nodes[parent]["Reports"] if parent != -1 else tree).append(entry)
+        return tree
+
+    def to_hierarchy(self):
+        """
+        Serializes to the existing Official -> Supervisor -> Employee JSON shape.
+        """
+        return self.graph.to_hierarchy()
+
+def read_diff(file_path):
+    """
+    Reads a roster diff. Rows whose optional 'Action' column is 'delete' are removals.
+    
+    Args:
+        file_path (str): Path to the diff file (.xlsx, .csv or .parquet).
+        
+    Returns:
+        tuple: (changed rows, removed employee names)
+    """
+    changed, removed = [], []
+    for chunk in iter_row_chunks(file_path, optional_columns=('Action',)):
+        for employee, supervisor, official, action in chunk:
+            if action and action.strip().lower() == 'delete':
+                removed.append(employee)
+            else:
+                changed.append((employee, supervisor, official))
+    return changed, removed
+
 def save_json(data, output_path):
     """
     Saves the data to a JSON file with proper formatting.
@@ -148,22 +753,34 @@ def main():
     # Define input and output file paths
     input_file = 'employees.xlsx'  # Replace with your Excel file path
     output_file = 'hierarchy.json'  # Replace with your desired JSON output path
+    state_file = 'hierarchy_state.pkl'  # Graph state reused by --diff runs
     
-    # Step 1: Read the Excel File
-    df = read_excel(input_file)
+    if len(sys.argv) > 2 and sys.argv[1] == '--validate':
+        sys.exit(1 if validate_hierarchy(sys.argv[2]) else 0)
     
-    # Step 4: Error Handling - Detect Cycles
+    # Step 1: Stream the roster into the graph (or apply a diff to the saved graph)
     try:
-        detect_cycles(df)
-    except ValueError as ve:
-        print(f"Error: {ve}")
+        if len(sys.argv) > 2 and sys.argv[1] == '--diff':
+            graph = HierarchyGraph.load_state(state_file)
+            graph.apply_diff(*read_diff(sys.argv[2]))
+        else:
+            graph = HierarchyGraph.from_file(sys.argv[1] if len(sys.argv) > 1 else input_file)
+    except Exception as e:
+        print(f"Error reading roster: {e}")
+        sys.exit(1)
+    
+    # Step 4: Error Handling - Detect Cycles
+    cycles = graph.find_cycles()
+    if cycles:
+        print(f"Error: {format_cycles(cycles)}")
         sys.exit(1)
     
     # Step 2: Construct Hierarchical JSON Tree
-    hierarchy = build_hierarchy(df)
+    hierarchy = graph.to_hierarchy()
     
     # Step 3: Output the JSON
     save_json(hierarchy, output_file)
+    graph.save_state(state_file)
 
 if __name__ == "__main__":
     main()
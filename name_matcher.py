@@ -0,0 +1,268 @@
+import math
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from awards.formatting import Formatter
+
+try:
+    from rapidfuzz.distance import OSA
+except ImportError:  # pure-Python banded edit distance is used instead
+    OSA = None
+
+LETTERS_PATTERN = re.compile(r"[a-z]+")
+SOUNDEX_CODES: dict[str, str] = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+DEFAULT_THRESHOLD: float = 0.8
+TRIGRAM_CANDIDATES: int = 25
+RARE_TRIGRAMS: int = 8  # a typo touches at most three trigrams
+MAX_TRIGRAM_SHARE: float = 0.05  # trigrams in more names than this are not indexed
+
+
+@dataclass(frozen=True)
+class NormalizedName:
+    last: str
+    first: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.last} {self.first}".strip()
+
+
+@dataclass
+class NameMatch:
+    query: str
+    match: Optional[str] = None
+    score: float = 0.0
+    indexes: list[int] = field(default_factory=list)
+
+
+@lru_cache(maxsize=65536)
+def normalize(name: str) -> Optional[NormalizedName]:
+    """
+    `Formatter.name` ("Last, First") reduced to lower-case letters per part,
+    so "McDonald, John A." and "John Mcdonald" normalize alike.
+    """
+    formatted = Formatter.name(name) if name else None
+    if not formatted:
+        return None
+    last, _, first = formatted.lower().partition(",")
+    last = "".join(LETTERS_PATTERN.findall(last))
+    first = " ".join(LETTERS_PATTERN.findall(first))
+    if not (last or first):
+        return None
+    return NormalizedName(last, first)
+
+
+@lru_cache(maxsize=65536)
+def soundex(word: str) -> str:
+    if not word:
+        return ""
+    code, previous = word[0].upper(), SOUNDEX_CODES.get(word[0], "")
+    for char in word[1:]:
+        digit = SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def blocking_keys(name: NormalizedName) -> tuple[str, ...]:
+    """
+    Keys under which a name is indexed; names sharing any key are compared.
+    Phonetic codes catch spelling variants, the prefix key catches typos
+    late in the surname, the first-name/suffix key catches typos early in
+    it, and the swapped key catches first/last reversals.
+    """
+    first_token = name.first.split(" ", 1)[0]
+    return (
+        f"s:{soundex(name.last)}:{soundex(first_token)}",
+        f"p:{name.last[:3]}:{first_token[:1]}",
+        f"f:{first_token}:{name.last[-2:]}",
+        f"s:{soundex(first_token)}:{soundex(name.last)}",
+    )
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions, so "Jonh" is one edit from "John"). With `max_distance`,
+    only the diagonal band that can stay within it is computed, and
+    max_distance + 1 is returned as soon as it is exceeded.
+    """
+    if OSA is not None:
+        return OSA.distance(a, b, score_cutoff=max_distance)
+    if len(a) < len(b):
+        a, b = b, a
+    len_a, len_b = len(a), len(b)
+    band = len_a if max_distance is None else max_distance
+    if len_a - len_b > band:
+        return band + 1
+    over = band + 1
+    previous_previous: list[int] = []
+    previous = [j if j <= band else over for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        current = [over] * (len_b + 1)
+        if i <= band:
+            current[0] = i
+        char_a = a[i - 1]
+        for j in range(max(1, i - band), min(len_b, i + band) + 1):
+            char_b = b[j - 1]
+            cost = previous[j - 1] + (char_a != char_b)
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if (
+                i > 1
+                and j > 1
+                and char_a == b[j - 2]
+                and a[i - 2] == char_b
+                and previous_previous[j - 2] + 1 < cost
+            ):
+                cost = previous_previous[j - 2] + 1
+            current[j] = cost
+        if max_distance is not None and min(current) > max_distance:
+            return over
+        previous_previous, previous = previous, current
+    return min(previous[-1], over) if max_distance is not None else previous[-1]
+
+
+def similarity(a: str, b: str, threshold: float = 0.0) -> float:
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    # The epsilon keeps float error (1 - 0.8 == 0.19999999999999996) from
+    # rejecting names exactly at the threshold.
+    max_distance = math.floor(longest * (1 - threshold) + 1e-9)
+    distance = edit_distance(a, b, max_distance)
+    return 1 - distance / longest if distance <= max_distance else 0.0
+
+
+class NameIndex:
+    """
+    Candidate roster indexed for fuzzy lookups.
+
+    Each distinct normalized name is stored once, under its exact key, its
+    blocking keys and its trigrams. A lookup tries the exact key, then
+    scores the names sharing a blocking key, and only falls back to the
+    trigram index (skipping very common trigrams) when no block clears the
+    threshold, so most lookups compare against a handful of names.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: list[str] = []
+        self.keys: list[str] = []
+        self.key_index: dict[str, int] = {}
+        self.rows: list[list[int]] = []
+        self.block_index: dict[str, list[int]] = {}
+        self.trigram_index: dict[str, list[int]] = {}
+        for row, name in enumerate(names):
+            normalized = normalize(name) if isinstance(name, str) else None
+            if normalized is None:
+                continue
+            key = normalized.key
+            idx = self.key_index.get(key)
+            if idx is None:
+                idx = self.key_index[key] = len(self.keys)
+                self.names.append(name)
+                self.keys.append(key)
+                self.rows.append([])
+                for block in blocking_keys(normalized):
+                    self.block_index.setdefault(block, []).append(idx)
+                for gram in trigrams(key):
+                    self.trigram_index.setdefault(gram, []).append(idx)
+            self.rows[idx].append(row)
+        max_postings = max(50, int(len(self.keys) * MAX_TRIGRAM_SHARE))
+        self.trigram_index = {
+            gram: postings
+            for gram, postings in self.trigram_index.items()
+            if len(postings) <= max_postings
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _best(self, key: str, candidates: Iterable[int], threshold: float) -> tuple[Optional[int], float]:
+        best_idx, best_score = None, 0.0
+        for idx in candidates:
+            score = similarity(key, self.keys[idx], max(threshold, best_score))
+            if score > best_score:
+                best_idx, best_score = idx, score
+        return (best_idx, best_score) if best_score >= threshold else (None, 0.0)
+
+    def _trigram_candidates(self, key: str) -> list[int]:
+        """Names sharing the most of the query's rarest trigrams."""
+        postings = sorted(
+            (self.trigram_index[gram] for gram in trigrams(key) if gram in self.trigram_index),
+            key=len,
+        )
+        counts = Counter(idx for posting in postings[:RARE_TRIGRAMS] for idx in posting)
+        return [idx for idx, _ in counts.most_common(TRIGRAM_CANDIDATES)]
+
+    def best_match(self, name: str, threshold: float = DEFAULT_THRESHOLD) -> NameMatch:
+        normalized = normalize(name) if isinstance(name, str) else None
+        if normalized is None:
+            return NameMatch(name)
+        key = normalized.key
+        idx = self.key_index.get(key)
+        score = 1.0
+        if idx is None:
+            candidates = {
+                candidate
+                for block in blocking_keys(normalized)
+                for candidate in self.block_index.get(block, ())
+            }
+            idx, score = self._best(key, candidates, threshold)
+            if idx is None:
+                idx, score = self._best(key, self._trigram_candidates(key), threshold)
+        if idx is None:
+            return NameMatch(name)
+        return NameMatch(name, self.names[idx], score, list(self.rows[idx]))
+
+    def match_all(self, names: Iterable[str], threshold: float = DEFAULT_THRESHOLD) -> list[NameMatch]:
+        return [self.best_match(name, threshold) for name in names]
+
+
+def reconcile(
+    left: Iterable[str], right: Iterable[str], threshold: float = DEFAULT_THRESHOLD
+) -> list[NameMatch]:
+    """Best match in `right` for every name in `left` (unmatched: match is None)."""
+    return NameIndex(right).match_all(left, threshold)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("usage: name_matcher.py <names.txt> <candidates.txt> [threshold]")
+        sys.exit(1)
+    threshold = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_THRESHOLD
+    with open(sys.argv[1], encoding="utf-8") as f:
+        left = [line.strip() for line in f if line.strip()]
+    with open(sys.argv[2], encoding="utf-8") as f:
+        right = [line.strip() for line in f if line.strip()]
+    matched = 0
+    for result in reconcile(left, right, threshold):
+        matched += result.match is not None
+        print(f"{result.query}  |  {result.match or '-'}  |  {result.score:.2f}")
+    print(f"\n{matched} of {len(left)} names matched.")
+
+
+if __name__ == "__main__":
+    main()
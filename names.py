@@ -3,189 +3,241 @@ from rich.traceback import install
 install(show_locals=True, width=200)
 
 import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bump whenever clean/key output changes; keys persisted extraction caches.
+FORMATTER_VERSION: str = "1"
+
+TITLES: frozenset[str] = frozenset(
+    {
+        "dr",
+        "mr",
+        "mrs",
+        "ms",
+        "prof",
+        "phd",
+        "miss",
+        "associate",
+        "administrator",
+        "manager",
+        "analyst",
+    }
+)
+
+NAME_PARTICLES: frozenset[str] = frozenset(
+    {
+        "mc",
+        "st",
+        "st.",
+        "de",
+        "da",
+        "di",
+        "du",
+        "la",
+        "le",
+        "el",
+        "lo",
+        "am",
+        "op",
+        "te",
+        "zu",
+        "im",
+        "af",
+        "av",
+        "al",
+        "ov",
+        "ev",
+    }
+)
 
-TITLES: list[str] = [
-    "dr",
-    "mr",
-    "mrs",
-    "ms",
-    "prof",
-    "phd",
-    "miss",
-    "associate",
-    "administrator",
-    "manager",
-    "analyst",
-]
-
-NAME_PARTICLES = [
-    "mc",
-    "st",
-    "st.",
-    "de",
-    "da",
-    "di",
-    "du",
-    "la",
-    "le",
-    "el",
-    "lo",
-    "am",
-    "op",
-    "te",
-    "zu",
-    "zu",
-    "im",
-    "af",
-    "av",
-    "al",
-    "ov",
-    "ev",
-]
-
-ENCLOSED_PATTERN = re.compile(r"(['\"])([a-zA-Z]{1,12})\1|(\()([a-zA-Z]{1,32})(\))")
-CREDENTIALS_PATTERN = re.compile(r"\b[a-zA-Z]{2,4}\.(?:[a-zA-Z])?\.?")
-ABBREVIATION_PATTERN = re.compile(r"\b[A-Za-z]\.")
 ALPHABET_PATTERN = re.compile(r"[a-zA-Z]+")
 CAPITALIZED_PATTERN = re.compile(r"[A-Z]")
 
-
-class NameFormatter:
-    def __init__(self, name_string: str):
-        self.name_string = name_string
-        self.name_parts: list[str] = self._name_parts()
-        self.first_name = None
-        self.last_name = None
-        self.full_name = None
-
-    def is_enclosed(self, part: str) -> bool:
-        return ENCLOSED_PATTERN.match(part) is not None
-
-    def is_abbreviation(self, part: str) -> bool:
-        return ABBREVIATION_PATTERN.fullmatch(part) is not None
-
-    def is_credential(self, part: str) -> bool:
-        return CREDENTIALS_PATTERN.fullmatch(part) is not None
-
-    def _is_valid(self, name_part: str) -> bool:
-        part_lower = name_part.lower()
-        if part_lower in NAME_PARTICLES:
+CONTROL_RUN_PATTERN = re.compile(r"[\r\t]+")
+NEWLINE_RUN_PATTERN = re.compile(r"\n{2,}")
+SPACE_RUN_PATTERN = re.compile(r" {2,}")
+KEY_TOKEN_PATTERN = re.compile(r"[a-zA-Z0-9]+")
+EDGE_PUNCTUATION_PATTERN = re.compile(r"^[^a-zA-Z0-9]+|[^a-zA-Z0-9]+$")
+INNER_PUNCTUATION_PATTERN = re.compile(r"[^a-zA-Z0-9]+")
+HYPHEN_RUN_PATTERN = re.compile(r"-+")
+
+# Tokens dropped from names: credentials, single-letter abbreviations, a
+# leading quoted or parenthesized nickname, and single characters.
+DROPPED_TOKEN_PATTERN = re.compile(
+    r"(?:[a-zA-Z]{2,4}\.[a-zA-Z]?\.?|[A-Za-z]\.|(?s:.))\Z"
+    r"|(['\"])[a-zA-Z]{1,12}\1|\([a-zA-Z]{1,32}\)"
+)
+# "Mc" or an apostrophe within the first three characters of a surname; the
+# character after it is upper-cased.
+SURNAME_PREFIX_PATTERN = re.compile(r"[^']{1,2}'|Mc(?=[^']*\Z)")
+
+
+Layout = Callable[[list[str], "NameRules"], Optional[tuple[str, str]]]
+
+
+@dataclass(frozen=True)
+class NameRules:
+    """
+    Rule table for one name style.
+
+    `tokenize` splits the text, everything up to the `lead_in` word is
+    skipped, and tokens that spell a title or match `drop_pattern` are
+    dropped (particles are always kept). `layout` turns the remaining tokens
+    into (last, first). Names with fewer than 2 or more than 5 capitals (as
+    counted by `count_capitals`) are re-cased with `case_part`, and
+    `surname_prefix_pattern` upper-cases the letter after a surname prefix
+    such as Mc or O'.
+    """
+
+    tokenize: Callable[[str], list[str]]
+    layout: Layout
+    preprocess: Optional[Callable[[str], Optional[str]]] = None
+    lead_in: Optional[str] = None
+    titles: frozenset[str] = frozenset()
+    particles: frozenset[str] = frozenset()
+    drop_pattern: Optional[re.Pattern] = None
+    count_capitals: Callable[[str], int] = lambda text: sum(map(str.isupper, text))
+    case_part: Callable[[str], str] = str.title
+    surname_prefix_pattern: Optional[re.Pattern] = None
+
+
+def _layout_by_count(parts: list[str], rules: NameRules) -> Optional[tuple[str, str]]:
+    """
+    "First Last", "Last, First", "First particle Last",
+    "First particle particle Last" and "First Last for ..." layouts.
+    """
+    first = last = None
+    count = len(parts)
+    if count == 5:
+        if parts[2] == "for":
+            first, last = parts[0], parts[1]
+    elif count == 4:
+        first, particle, article, noun = parts
+        if particle.lower() in rules.particles and article.lower() in rules.particles:
+            last = f"{particle} {article} {noun}"
+    elif count == 3:
+        first, particle, article = parts
+        if particle.lower() in rules.particles:
+            last = f"{particle} {article}"
+        elif first.endswith(","):
+            last, first = parts[0], parts[1]
+    elif count == 2:
+        first, last = parts
+        if first.endswith(","):
+            last, first = first, last
+        first, last = first.replace(",", "").strip(), last.replace(",", "").strip()
+    if not (first and last):
+        return None
+    return last.replace(",", ""), first
+
+
+def _layout_leading_pair(parts: list[str], rules: NameRules) -> tuple[str, str]:
+    """The first two tokens as "Last, First" / "Last,First" / "First Last"."""
+    head = parts[0]
+    if head.endswith(","):
+        return head[:-1], parts[1]
+    if "," in head:
+        last, first = head.split(",")
+        return last, first
+    return parts[1], parts[0]
+
+
+class NameEngine:
+    """
+    Formats names as "Last, First" according to one `NameRules` table.
+
+    `format` is memoized for the life of the process, so a name repeated
+    across files and subsystems is parsed once; `cache_info` reports the
+    hits and misses.
+    """
+
+    def __init__(self, rules: NameRules, maxsize: int = 65536):
+        self.rules = rules
+        self.format = lru_cache(maxsize=maxsize)(self._format)
+        self.cache_info = self.format.cache_info
+        self.cache_clear = self.format.cache_clear
+
+    def _keep(self, token: str) -> bool:
+        rules = self.rules
+        if token.lower() in rules.particles:
             return True
-
-        normalized = "".join(ALPHABET_PATTERN.findall(name_part)).lower()
-        if normalized in TITLES:
+        if rules.titles and "".join(ALPHABET_PATTERN.findall(token)).lower() in rules.titles:
             return False
+        return rules.drop_pattern is None or rules.drop_pattern.match(token) is None
+
+    def tokens(self, text: str) -> list[str]:
+        rules = self.rules
+        parts = rules.tokenize(text)
+        if rules.lead_in is not None:
+            for idx, part in enumerate(parts):
+                if part.lower() == rules.lead_in:
+                    parts = parts[idx + 1 :]
+                    break
+        if rules.titles or rules.drop_pattern is not None:
+            parts = [part for part in parts if self._keep(part)]
+        return parts
+
+    def assemble(self, last: str, first: str) -> str:
+        rules = self.rules
+        if not 2 <= rules.count_capitals(last + first) <= 5:
+            last, first = rules.case_part(last), rules.case_part(first)
+            prefix = rules.surname_prefix_pattern and rules.surname_prefix_pattern.match(last)
+            if prefix:
+                end = prefix.end()
+                last = f"{last[:end]}{last[end].upper()}{last[end + 1:]}"
+        return f"{last}, {first}"
+
+    def resolve(self, text: str) -> str:
+        """`text` as "Last, First", or unchanged when no layout fits."""
+        names = self.rules.layout(self.tokens(text), self.rules)
+        return self.assemble(*names) if names else text
+
+    def _format(self, text: str) -> Optional[str]:
+        if self.rules.preprocess is not None:
+            text = self.rules.preprocess(text)
+            if not text:
+                return None
+        return self.resolve(text)
+
+def _control_replacement(match: re.Match) -> str:
+    return "\n" if match.group(0) == "\r" else " "
 
-        if (
-            self.is_credential(name_part)
-            or self.is_enclosed(name_part)
-            or self.is_abbreviation(name_part)
-            or len(name_part) == 1
-        ):
-            return False
-
-        return True
-
-    def _name_parts(self) -> list[str]:
-        parts = self.name_string.split(" ")
-        for idx, part in enumerate(parts):
-            if part.lower() == "for":
-                parts = parts[idx + 1 :]
-                break
-        return [part for part in parts if self._is_valid(part)]
-
-    def extract_names_from_five_parts(self):
-        if self.first_name and self.last_name:
-            return
-
-        if len(self.name_parts) == 5:
-            first_name, last_name, preposition = self.name_parts[:3]
-            if preposition == "for":
-                self.first_name = first_name
-                self.last_name = last_name
-
-    def extract_names_from_four_parts(self):
-        if self.first_name and self.last_name:
-            return
-
-        if len(self.name_parts) == 4:
-            first_name, preposition, article, noun = self.name_parts
-            if (
-                preposition.lower() in NAME_PARTICLES
-                and article.lower() in NAME_PARTICLES
-            ):
-                self.first_name = first_name
-                self.last_name = f"{preposition} {article} {noun}"
-
-    def extract_names_from_three_parts(self):
-        if self.first_name and self.last_name:
-            return
-
-        if len(self.name_parts) == 3:
-            first_name, preposition, article = self.name_parts
-            if preposition.lower() in NAME_PARTICLES:
-                self.first_name = first_name
-                self.last_name = f"{preposition} {article}"
-            elif first_name.endswith(","):
-                self.last_name, self.first_name, _ = self.name_parts
-
-    def extract_names_from_two_parts(self):
-        if self.first_name and self.last_name:
-            return
-
-        if len(self.name_parts) == 2:
-            first_name, last_name = self.name_parts
-            if first_name.endswith(","):
-                last_name, first_name = first_name, last_name
-            self.first_name = first_name.replace(",", "").strip()
-            self.last_name = last_name.replace(",", "").strip()
-
-    def extract_names(self):
-        self.extract_names_from_five_parts()
-        self.extract_names_from_four_parts()
-        self.extract_names_from_three_parts()
-        self.extract_names_from_two_parts()
-
-    def set_full_name(self):
-        if self.first_name and self.last_name:
-            full_name = ", ".join([self.last_name.replace(",",""), self.first_name])
-            capitalized_count: int = len(CAPITALIZED_PATTERN.findall(full_name))
-            if not (2 <= capitalized_count <= 5):
-                full_name = full_name.title()
-            self.full_name = full_name
-
-    def format_last_first(self) -> str | None:
-        self.extract_names()
-        self.set_full_name()
-        if self.full_name:
-            return self.full_name
-        return self.name_string
 
 class Formatter:
     @staticmethod
     def clean(text: str) -> str | None:
+        # Each pass is skipped when it cannot change the text; output is
+        # identical to running every pass unconditionally.
         text = str(text).strip()
-        text = text.encode("ascii", errors="ignore").decode("ascii")
-        text = re.sub(r"[\r\t]+", lambda m: "\n" if m.group(0) == "\r" else " ", text)
-        text = re.sub(r"\n{2,}", "\n", text)
-        text = re.sub(r" {2,}", " ", text)
+        if not text.isascii():
+            text = text.encode("ascii", errors="ignore").decode("ascii")
+        if "\r" in text or "\t" in text:
+            text = CONTROL_RUN_PATTERN.sub(_control_replacement, text)
+        if "\n\n" in text:
+            text = NEWLINE_RUN_PATTERN.sub("\n", text)
+        if "  " in text:
+            text = SPACE_RUN_PATTERN.sub(" ", text)
         return text.strip() if text else None
 
     @staticmethod
+    @lru_cache(maxsize=8192)
     def key(text: str) -> str | None:
+        # Field names repeat across every PDF, so results are memoized.
         text = Formatter.clean(text)
         if not text:
             return None
 
-        matches = re.findall(r"[a-zA-Z0-9]+", text)
+        matches = KEY_TOKEN_PATTERN.findall(text)
         return "_".join(matches).lower()
 
     @staticmethod
     def name(text: str) -> str | None:
-        text = Formatter.clean(text)
-        if not text:
-            return None
-        return NameFormatter(text).format_last_first()
+        return NAME_ENGINE.format(text)
 
     @staticmethod
     def is_list_item(line: str) -> bool:
@@ -233,9 +285,9 @@ class Formatter:
 
     @staticmethod
     def _fmtpart(part: str) -> str | None:
-        part = re.sub(r"^[^a-zA-Z0-9]+|[^a-zA-Z0-9]+$", "", part)
-        part = re.sub(r"[^a-zA-Z0-9]+", "-", part).upper()
-        part = re.sub(r"-+", "-", part)
+        part = EDGE_PUNCTUATION_PATTERN.sub("", part)
+        part = INNER_PUNCTUATION_PATTERN.sub("-", part).upper()
+        part = HYPHEN_RUN_PATTERN.sub("-", part)
         return part if part else None
 
     @staticmethod
@@ -245,10 +297,84 @@ class Formatter:
             return None
 
         parts = [
-            Formatter._fmtpart(part)
+            formatted
             for part in text.split()
-            if Formatter._fmtpart(part)
+            if (formatted := Formatter._fmtpart(part))
         ]
         return "-".join(parts) if parts else None
 
+
+NAME_RULES = NameRules(
+    tokenize=lambda text: text.split(" "),
+    layout=_layout_by_count,
+    preprocess=Formatter.clean,
+    lead_in="for",
+    titles=TITLES,
+    particles=NAME_PARTICLES,
+    drop_pattern=DROPPED_TOKEN_PATTERN,
+    count_capitals=lambda text: len(CAPITALIZED_PATTERN.findall(text)),
+)
+# Outlook recipients and message bodies: the first two words, capitalized.
+OUTLOOK_NAME_RULES = NameRules(
+    tokenize=lambda text: text.split() if " " in text else [text],
+    layout=_layout_leading_pair,
+    case_part=str.capitalize,
+    surname_prefix_pattern=SURNAME_PREFIX_PATTERN,
+)
+NAME_ENGINE = NameEngine(NAME_RULES)
+OUTLOOK_NAME_ENGINE = NameEngine(OUTLOOK_NAME_RULES)
+
+
+def name_cache_stats() -> dict[str, tuple]:
+    """Hits, misses, maxsize and current size of each name cache."""
+    return {
+        "name": NAME_ENGINE.cache_info(),
+        "outlook": OUTLOOK_NAME_ENGINE.cache_info(),
+    }
+
+
+class NameFormatter:
+    """`NAME_ENGINE` behind the original one-name-per-instance interface."""
+
+    def __init__(self, name_string: str):
+        self.name_string = name_string
+        self.name_parts: list[str] = NAME_ENGINE.tokens(name_string)
+        self.first_name = None
+        self.last_name = None
+        self.full_name = None
+
+    def format_last_first(self) -> str | None:
+        names = NAME_RULES.layout(self.name_parts, NAME_RULES)
+        if names:
+            self.last_name, self.first_name = names
+            self.full_name = NAME_ENGINE.assemble(*names)
+        return self.full_name or self.name_string
+
+
+class OutlookNameFormatter:
+    """`OUTLOOK_NAME_ENGINE` behind the interface parse_outlook_msgs uses."""
+
+    @staticmethod
+    def format_name(raw_name: str) -> str:
+        if not raw_name:
+            raise ValueError("Name field is blank.")
+        return OUTLOOK_NAME_ENGINE.format(raw_name)
+
+
+def format_names(names: "Iterable[str] | pd.Series") -> "list[str | None] | pd.Series":
+    """
+    Formats many names at once; results match `Formatter.name` for each input.
+
+    Repeated names are formatted once (`Formatter.name` is memoized). For a
+    pandas Series this is not a vectorized string operation: each unique
+    value is formatted and the results are mapped back with `Series.map`,
+    returning a Series aligned to the input index. Any other iterable
+    returns a list.
+    """
+    if hasattr(names, "unique") and hasattr(names, "map"):
+        formatted = {value: Formatter.name(value) for value in names.unique()}
+        return names.map(formatted)
+    return [Formatter.name(name) for name in names]
+
+
 formatter = Formatter()
@@ -0,0 +1,163 @@
+import json
+import pickle
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Optional
+
+from awards.formatting import Formatter
+
+SNAPSHOT_VERSION: int = 2
+SYMBOL_SEPARATOR_PATTERN = re.compile(r"[-\s]+")
+# Joins normalized symbol segments; sorts before any letter or digit, so a
+# symbol's sub-orgs sort directly after it ("blm\x1fwo" < "blm\x1fwo\x1f10").
+SEGMENT_SEPARATOR: str = "\x1f"
+
+
+def _symbol_segments(symbol: str) -> list[str]:
+    return [segment for segment in SYMBOL_SEPARATOR_PATTERN.split(symbol or "") if segment]
+
+
+def _segment_key(symbol: str) -> str:
+    """Normalized symbol that keeps its hyphen/space segment boundaries."""
+    segments = (Formatter.standardized_org_div(segment) for segment in _symbol_segments(symbol))
+    return SEGMENT_SEPARATOR.join(segment for segment in segments if segment)
+
+
+class OrgRegistry:
+    """
+    Indexed view of the org list written by `extract_and_save_org_data.save_as_json`.
+
+    Records are indexed by code, symbol, normalized title and normalized
+    symbol (`Formatter.standardized_org_div`). Symbols are also kept sorted
+    by segment key (normalized segments joined by SEGMENT_SEPARATOR), so
+    prefix queries are a bisect plus the matching slice, and division
+    roll-up probes the symbol index once per leading run of symbol segments.
+    """
+
+    def __init__(self, records: list[dict]):
+        self.records: list[dict] = [
+            {"code": r["code"], "symbol": r["symbol"], "title": r["title"]}
+            for r in records
+        ]
+        self.code_index: dict[str, int] = {}
+        self.symbol_index: dict[str, int] = {}
+        self.normalized_symbol_index: dict[str, int] = {}
+        self.title_index: dict[str, list[int]] = {}
+        self.segment_index: dict[str, int] = {}
+        for idx, record in enumerate(self.records):
+            self.code_index.setdefault(record["code"], idx)
+            self.symbol_index.setdefault(record["symbol"], idx)
+            normalized_symbol = Formatter.standardized_org_div(record["symbol"])
+            if normalized_symbol:
+                self.normalized_symbol_index.setdefault(normalized_symbol, idx)
+                self.segment_index.setdefault(_segment_key(record["symbol"]), idx)
+            normalized_title = Formatter.standardized_org_div(record["title"])
+            if normalized_title:
+                self.title_index.setdefault(normalized_title, []).append(idx)
+        self.sorted_segment_keys: list[str] = sorted(self.segment_index)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def by_code(self, code: str) -> Optional[dict]:
+        idx = self.code_index.get(code)
+        return self.records[idx] if idx is not None else None
+
+    def by_symbol(self, symbol: str) -> Optional[dict]:
+        idx = self.symbol_index.get(symbol)
+        if idx is None:
+            idx = self.normalized_symbol_index.get(Formatter.standardized_org_div(symbol))
+        return self.records[idx] if idx is not None else None
+
+    def by_title(self, title: str) -> list[dict]:
+        normalized = Formatter.standardized_org_div(title)
+        return [self.records[idx] for idx in self.title_index.get(normalized, [])]
+
+    def resolve(self, org: str) -> Optional[dict]:
+        """Resolves free text (code, symbol or title) to a single record."""
+        if not org:
+            return None
+        org = org.strip()
+        match = self.by_code(org) or self.by_symbol(org)
+        if match:
+            return match
+        titles = self.by_title(org)
+        return titles[0] if len(titles) == 1 else None
+
+    def with_prefix(self, prefix: str) -> list[dict]:
+        """
+        All orgs whose symbol starts with the prefix's segments: the prefix
+        itself and its sub-orgs ("BLM-WO-10" matches "BLM-WO-10-A", never
+        "BLM-WO-100").
+        """
+        key = _segment_key(prefix)
+        sub_org_prefix = key + SEGMENT_SEPARATOR if key else ""
+        start = bisect_left(self.sorted_segment_keys, key)
+        matches = []
+        for segment_key in self.sorted_segment_keys[start:]:
+            if segment_key != key and not segment_key.startswith(sub_org_prefix):
+                break
+            matches.append(self.records[self.segment_index[segment_key]])
+        return matches
+
+    def division_of(self, org: str, include_self: bool = False) -> Optional[dict]:
+        """
+        Rolls an org up to the closest registered ancestor: the registered
+        symbol made of the most leading hyphen/space-delimited segments of
+        the org's symbol ("BLM-WO-100" -> "BLM-WO" -> "BLM", never "BLM-WO-10").
+        """
+        segments = _symbol_segments(org)
+        if not segments:
+            return None
+        longest = len(segments) if include_self else len(segments) - 1
+        for count in range(longest, 0, -1):
+            normalized = Formatter.standardized_org_div("-".join(segments[:count]))
+            idx = self.normalized_symbol_index.get(normalized) if normalized else None
+            if idx is not None:
+                return self.records[idx]
+        return None
+
+    @classmethod
+    def from_json(cls, json_path: Path | str) -> "OrgRegistry":
+        with open(json_path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def save_snapshot(self, snapshot_path: Path | str, source: Optional[Path | str] = None) -> None:
+        """Pickles the built indexes, tagged with the source file's size and mtime."""
+        stamp = _file_stamp(source) if source else None
+        with open(snapshot_path, "wb") as f:
+            pickle.dump((SNAPSHOT_VERSION, stamp, self.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load_snapshot(cls, snapshot_path: Path | str) -> tuple[Optional[tuple], "OrgRegistry"]:
+        with open(snapshot_path, "rb") as f:
+            version, stamp, state = pickle.load(f)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        registry = cls.__new__(cls)
+        registry.__dict__.update(state)
+        return stamp, registry
+
+    @classmethod
+    def load(cls, json_path: Path | str, snapshot_path: Optional[Path | str] = None) -> "OrgRegistry":
+        """
+        Loads from the snapshot when it matches the JSON file, otherwise
+        rebuilds from JSON and refreshes the snapshot.
+        """
+        snapshot_path = Path(snapshot_path or Path(json_path).with_suffix(".idx"))
+        if snapshot_path.exists():
+            try:
+                stamp, registry = cls.load_snapshot(snapshot_path)
+                if stamp == _file_stamp(json_path):
+                    return registry
+            except (ValueError, pickle.UnpicklingError, EOFError):
+                pass
+        registry = cls.from_json(json_path)
+        registry.save_snapshot(snapshot_path, source=json_path)
+        return registry
+
+
+def _file_stamp(path: Path | str) -> tuple[int, int]:
+    stat = Path(path).stat()
+    return stat.st_size, stat.st_mtime_ns
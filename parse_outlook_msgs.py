@@ -1,52 +1,7 @@
 import os
 import win32com.client
 
-class NameFormatter:
-    @staticmethod
-    def _split_name(raw_name: str) -> list[str]:
-        return raw_name.split() if " " in raw_name else [raw_name]
-
-    @staticmethod
-    def _format_last_name(last_name: str) -> str:
-        chars = list(last_name)
-        if "'" in last_name:
-            apostrophe_idx = chars.index("'")
-            if 1 <= apostrophe_idx <= 2:
-                chars[apostrophe_idx + 1] = chars[apostrophe_idx + 1].upper()
-        elif last_name.lower().startswith("mc"):
-            chars[2] = chars[2].upper()
-        return "".join(chars)
-
-    @staticmethod
-    def _standardize_name_parts(name_parts: list[str] | str) -> tuple[str, str]:
-        last_name, first_name = "", ""
-        if isinstance(name_parts, list):
-            if name_parts[0].endswith(","):
-                last_name, first_name = name_parts[0][:-1], name_parts[1]
-            elif "," in name_parts[0]:
-                last_name, first_name = name_parts[0].split(",")
-            else:
-                first_name, last_name = name_parts[0], name_parts[1]
-        elif isinstance(name_parts, str):
-            if "," in name_parts:
-                last_name, first_name = name_parts.split(",")
-
-        uppercase_count = sum(c.isupper() for c in last_name + first_name)
-        if not (2 <= uppercase_count <= 5):
-            last_name, first_name = (
-                NameFormatter._format_last_name(last_name.capitalize()),
-                first_name.capitalize(),
-            )
-
-        return last_name, first_name
-
-    @staticmethod
-    def format_name(raw_name: str) -> str:
-        if not raw_name:
-            raise ValueError("Name field is blank.")
-        name_parts = NameFormatter._split_name(raw_name)
-        last_name, first_name = NameFormatter._standardize_name_parts(name_parts)
-        return ", ".join([last_name, first_name])
+from awards.formatting import OutlookNameFormatter
 
 
 def rename_file(file_path: str, supervisor_name: str, employee_name: str) -> str:
@@ -73,7 +28,7 @@ def get_supervisor_and_employee_names(file_path: str) -> list[str]:
         supervisor_name = supervisor_name.split("@")[0].title()
     cleaned_supervisor_name = supervisor_name.replace(".", " ").replace("'", "").strip()
     del outlook, msg
-    return [NameFormatter.format_name(i) for i in [cleaned_supervisor_name, employee_name]]
+    return [OutlookNameFormatter.format_name(i) for i in [cleaned_supervisor_name, employee_name]]
 
 def process_files(files: list[str]) -> None:
     for file in files:
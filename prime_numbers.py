@@ -1,44 +1,143 @@
-import time
-import yaml
-
-def log_prime_metrics_to_yaml(prime_index: int, total_primes: int, largest_prime: int, execution_time: str) -> None:
-    with open('data.yaml', 'r+') as file:
-        try:
-            prime_metrics = yaml.safe_load(file)
-            prime_metrics = {} if not prime_metrics else prime_metrics
-        except yaml.YAMLError:
-            prime_metrics = {}
-
-    if not prime_metrics.get(prime_index):
-        prime_metrics[prime_index] = {}
-    prime_metrics[prime_index]['total_primes'] = total_primes
-    prime_metrics[prime_index]['largest_prime'] = largest_prime
-    prime_metrics[prime_index]['execution_time'] = execution_time
-
-    with open('data.yaml','w') as file:
-        yaml.safe_dump(prime_metrics, file, default_flow_style=False)
-
-def is_prime(number: int) -> None:
-    total_divisors = sum(1 for i in range(2,number) if number %i == 0)
-    return total_divisors == 0
-
-def calculate_prime_metrics(max_number: int) -> None:
-    timer_start: float = time.time()
-    prime_numbers: list[int] = [i for i in range(max_number) if is_prime(i)]
-    timer_end: float = time.time()
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from math import isqrt
+from typing import Iterator
+
+from benchmark_history import BenchmarkHistory, measure
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python bytearray segments are used instead
+    np = None
+
+# Odd numbers per segment; each segment needs one byte per odd number.
+SEGMENT_SIZE: int = 1 << 20
+
+def is_prime(number: int) -> bool:
+    if number < 2:
+        return False
+    if number % 2 == 0:
+        return number == 2
+    return all(number % divisor for divisor in range(3, isqrt(number) + 1, 2))
+
+def base_primes(limit: int) -> list[int]:
+    """Odd primes <= limit; the sieving primes for every segment below limit**2."""
+    if limit < 3:
+        return []
+    flags = bytearray(b'\x01') * ((limit - 1) // 2)  # index i <-> 2i + 3
+    for i in range((isqrt(limit) - 1) // 2):
+        if flags[i]:
+            p = 2 * i + 3
+            start = (p * p - 3) // 2
+            flags[start::p] = bytes(len(range(start, len(flags), p)))
+    return [2 * i + 3 for i in compress(range(len(flags)), flags)]
+
+def sieve_segment(low: int, high: int, primes: list[int]):
+    """
+    Sieves the odd numbers in [low, high) (low even) with the given odd primes.
+    Slot i of the returned flags stands for low + 2i + 1.
+    """
+    size = (high - low) // 2
+    segment = np.ones(size, dtype=np.bool_) if np is not None else bytearray(b'\x01') * size
+    for p in primes:
+        if p * p >= high:
+            break
+        first = max(p * p, ((low + 1 + p - 1) // p) * p)
+        if first % 2 == 0:
+            first += p
+        index = (first - low - 1) // 2
+        if np is not None:
+            segment[index::p] = False
+        else:
+            segment[index::p] = bytes(len(range(index, size, p)))
+    if low == 0 and size:
+        segment[0] = 0  # 1 is not prime
+    return segment
+
+def _segment_bounds(max_number: int, segment_size: int) -> Iterator[tuple[int, int]]:
+    span = 2 * segment_size
+    end = max_number + (max_number % 2)  # odd numbers below max_number, even bound
+    for low in range(0, end, span):
+        yield low, min(low + span, end)
+
+def _primes_in_segment(low: int, segment, max_number: int) -> list[int]:
+    if np is not None:
+        primes = (np.flatnonzero(segment) * 2 + (low + 1)).tolist()
+    else:
+        primes = list(compress(range(low + 1, low + 2 * len(segment), 2), segment))
+    while primes and primes[-1] >= max_number:
+        primes.pop()
+    return primes
+
+def iter_primes(max_number: int, segment_size: int = SEGMENT_SIZE) -> Iterator[int]:
+    """Streams the primes below max_number using bounded memory per segment."""
+    if max_number > 2:
+        yield 2
+    primes = base_primes(isqrt(max_number))
+    for low, high in _segment_bounds(max_number, segment_size):
+        yield from _primes_in_segment(low, sieve_segment(low, high, primes), max_number)
+
+_worker_primes: list[int] = []
+
+def _init_worker(primes: list[int]) -> None:
+    global _worker_primes
+    _worker_primes = primes
+
+def _segment_metrics(bounds: tuple[int, int], max_number: int, primes: list[int] | None = None) -> tuple[int, int]:
+    low, high = bounds
+    segment = sieve_segment(low, high, _worker_primes if primes is None else primes)
+    if np is not None:
+        indexes = np.flatnonzero(segment)
+        count = int(indexes.size)
+        largest = int(indexes[-1]) * 2 + low + 1 if count else 0
+    else:
+        count = segment.count(1)
+        last = segment.rfind(1)
+        largest = last * 2 + low + 1 if last >= 0 else 0
+    if largest >= max_number:  # only the last segment can overshoot, by one odd number
+        count -= 1
+        largest = next((n for n in range(largest - 2, low, -2) if is_prime(n)), 0)
+    return count, largest
+
+def prime_metrics(max_number: int, workers: int = 1, segment_size: int = SEGMENT_SIZE) -> tuple[int, int]:
+    """
+    Returns (number of primes below max_number, largest prime below max_number)
+    without materializing the primes. Segments are sieved in `workers` processes.
+    """
+    if max_number <= 2:
+        return 0, 0
+    primes = base_primes(isqrt(max_number))
+    bounds = list(_segment_bounds(max_number, segment_size))
+    if workers > 1 and len(bounds) > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(primes,)) as executor:
+            results = list(executor.map(_segment_metrics, bounds, [max_number] * len(bounds)))
+    else:
+        results = [_segment_metrics(segment, max_number, primes) for segment in bounds]
+    total_primes = 1 + sum(count for count, _ in results)  # + 2
+    largest_prime = max((largest for _, largest in results), default=0) or 2
+    return total_primes, largest_prime
+
+def calculate_prime_metrics(
+    max_number: int, workers: int = 1, history: BenchmarkHistory | None = None, trace_memory: bool = False
+) -> None:
+    run, (total_primes, largest_prime) = measure(
+        benchmark='prime_metrics',
+        params={'max_number': max_number, 'workers': workers},
+        algorithm=f"segmented_sieve[{'numpy' if np is not None else 'bytearray'}]",
+        func=lambda: prime_metrics(max_number, workers),
+        trace_memory=trace_memory,
+    )
 
     metrics_summary = {
-        'total_primes':     len(prime_numbers),
-        'largest_prime':    prime_numbers[-1],
-        'execution_time':   f'{(timer_end-timer_start):.8f} sec.',
+        'total_primes':     total_primes,
+        'largest_prime':    largest_prime,
+        'execution_time':   f'{run.wall_time:.8f} sec.',
     }
+    if run.peak_memory_kb is not None:
+        metrics_summary['peak_memory'] = f'{run.peak_memory_kb:,} KiB'
 
-    log_prime_metrics_to_yaml(
-        prime_index=    max_number,
-        total_primes=   metrics_summary['total_primes'],
-        largest_prime=  metrics_summary['largest_prime'],
-        execution_time= metrics_summary['execution_time']
-    )
+    run.metrics = {'total_primes': total_primes, 'largest_prime': largest_prime}
+    (history or BenchmarkHistory()).record(run)
 
     padding_length = max(len(metric_name) for metric_name in metrics_summary) + 2
     formatted_metrics_output = (
@@ -51,27 +150,12 @@ def calculate_prime_metrics(max_number: int) -> None:
     print('.'*50,'\n')
 
 
-print()
-print('calculating primes up to 10')
-n = 10
-calculate_prime_metrics(n)
-
-print('calculating primes up to 100')
-n = 100
-calculate_prime_metrics(n)
-
-print('calculating primes up to 1_000')
-n = 1_000
-calculate_prime_metrics(n)
-
-print('calculating primes up to 10_000')
-n = 10_000
-calculate_prime_metrics(n)
-
-print('calculating primes up to 100_000')
-n = 100_000
-calculate_prime_metrics(n)
-
-print('calculating primes up to 1_000_000')
-n = 1_000_000
-calculate_prime_metrics(n)
+if __name__ == '__main__':
+    print()
+    for exponent in range(1, 10):
+        n = 10 ** exponent
+        print(f'calculating primes up to {n:_}')
+        # Pool workers' memory is not traced; only trace the single-process runs.
+        workers = 4 if n >= 10 ** 8 else 1
+        calculate_prime_metrics(n, workers=workers, trace_memory=workers == 1)
+    print(BenchmarkHistory().report('prime_metrics'))
@@ -1,6 +1,9 @@
 from datetime import datetime
 from pathlib import Path
 import os
+import sys
+
+from dir_watcher import DirectoryWatcher
 
 
 DOWNLOADS_DIRECTORY: str
@@ -24,6 +27,10 @@ def rename_and_move_file(file_path: str):
     print(f"renamed file: {new_name}")
 
 
+def is_appraisal_file(file_path: Path) -> bool:
+    return "pams-appraisal" in file_path.name.lower()
+
+
 def process_appraisal_data() -> None:
     print("\nstart...\n")
     try:
@@ -33,7 +40,7 @@ def process_appraisal_data() -> None:
         files: list[str] = [
             file
             for file in Path(DOWNLOADS_DIRECTORY).iterdir()
-            if "pams-appraisal" in Path(file).name.lower()
+            if is_appraisal_file(Path(file))
         ]
         if not files:
             raise ValueError("No PAMS appraisal files found.")
@@ -48,5 +55,20 @@ def process_appraisal_data() -> None:
     print("\nfinished...\n")
 
 
+def watch_appraisal_data(debounce: float = 2.0) -> None:
+    """Renames and moves PAMS appraisal files as soon as their download finishes."""
+    if not os.path.isdir(DOWNLOADS_DIRECTORY):
+        raise ValueError(f"invalid directory: {DOWNLOADS_DIRECTORY}")
+    DirectoryWatcher(
+        [DOWNLOADS_DIRECTORY],
+        lambda file_path: rename_and_move_file(str(file_path)),
+        file_filter=is_appraisal_file,
+        debounce=debounce,
+    ).run()
+
+
 if __name__ == "__main__":
-    process_appraisal_data()
+    if "--watch" in sys.argv[1:]:
+        watch_appraisal_data()
+    else:
+        process_appraisal_data()
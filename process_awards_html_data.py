@@ -1,30 +1,305 @@
+import codecs
+import hashlib
+import html
+import os
+import re
+import sqlite3
 from datetime import datetime, timedelta
-from time import sleep
+from functools import lru_cache
+from html.parser import HTMLParser
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
 
-from bs4 import BeautifulSoup
+from dir_watcher import DirectoryWatcher
 
+try:
+    import lxml.html
+except ImportError:  # stdlib tokenizer below is used instead
+    lxml = None
 
-def get_html_content() -> str:
-    file: str = "html_data_dump.html"
-    with open(file, "r") as f:
-        html_content: str = f.read()
-        sections: list[str] = [
-            section.strip() for section in html_content.split("<tr>") if section.strip()
-        ]
-        cleaned_content: str = "\n".join(
-            line.strip()
-            for section in sections
-            for line in section.split("\n")
-            if line.strip()
+HTML_DUMP_PATH: Path = Path("html_data_dump.html")
+OUTPUT_PATH: Path = Path("file.txt")
+AWARD_STORE_PATH: Path = Path("awards.sqlite3")
+WINDOW_REPORT_PATH: Path = Path("award_window.txt")
+AWARD_WINDOW: timedelta = timedelta(days=365)
+READ_CHUNK_SIZE: int = 1024 * 1024
+
+# Three-digit NOA codes of the awards to report.
+NOA_CODES: frozenset[str] = frozenset()
+
+NOA_CATEGORIES: dict[int, dict[str, str]] = {
+    000: {"category": "000"},
+}
+
+# Lower-cased header text -> record field. Without a header row, the columns
+# sit at the same offsets the text parser assumes (code, date, ..., value).
+HEADER_ALIASES: dict[str, str] = {
+    "noa": "noa",
+    "noa code": "noa",
+    "nature of action": "noa",
+    "date": "date",
+    "effective date": "date",
+    "award date": "date",
+    "amount": "value",
+    "award amount": "value",
+    "hours": "value",
+    "value": "value",
+}
+DEFAULT_COLUMNS: dict[str, int] = {"noa": 0, "date": 1, "value": 5}
+
+TABLE_TAG_PATTERN = re.compile(r"<(/?)(tr|td|th|table)\b[^>]*>", re.IGNORECASE)
+INNER_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+
+class AwardRecord(NamedTuple):
+    noa_code: int
+    award_date: datetime
+    award_value: int
+
+
+def clean_html_content(html_content: str) -> str:
+    sections: list[str] = [
+        section.strip() for section in html_content.split("<tr>") if section.strip()
+    ]
+    return "\n".join(
+        line.strip()
+        for section in sections
+        for line in section.split("\n")
+        if line.strip()
+    )
+
+
+class HtmlDumpReader:
+    """
+    Reads only what was added to the dump file since the last read.
+
+    The offset is reset when the dump was replaced rather than appended to:
+    the file is a different inode, it shrank, or the bytes at the start or
+    just before the offset no longer match what was read. A full re-dump
+    keeps the same HTML head, so the window ending at the offset is what
+    catches a larger rewrite in place. The dump is left in place instead of
+    being truncated after every read.
+    """
+
+    WINDOW_BYTES: int = 4096
+
+    def __init__(self, path: Path = HTML_DUMP_PATH):
+        self.path = Path(path)
+        self.offset = 0
+        self.file_id: tuple[int, int] = (0, 0)
+        self.consumed_digest = b""
+        self.restarted = False
+
+    def _consumed_digest(self, f, length: int) -> bytes:
+        """Digest of the first and last WINDOW_BYTES of the first `length` bytes."""
+        digest = hashlib.blake2b()
+        f.seek(0)
+        digest.update(f.read(min(length, self.WINDOW_BYTES)))
+        if length > self.WINDOW_BYTES:
+            tail_start = max(length - self.WINDOW_BYTES, self.WINDOW_BYTES)
+            f.seek(tail_start)
+            digest.update(f.read(length - tail_start))
+        return digest.digest()
+
+    def _replaced(self, f, size: int, file_id: tuple[int, int]) -> bool:
+        if not self.offset:
+            return False
+        return (
+            file_id != self.file_id
+            or size < self.offset
+            or self._consumed_digest(f, self.offset) != self.consumed_digest
         )
-    with open(file, "w") as f:
-        pass
-    return cleaned_content
+
+    def iter_new(self, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+        """Yields the content added since the last read in decoded chunks."""
+        self.restarted = False
+        with self.path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            size, file_id = stat.st_size, (stat.st_dev, stat.st_ino)
+            if self._replaced(f, size, file_id):
+                self.offset, self.restarted = 0, True
+            self.file_id = file_id
+            if size == self.offset:
+                return
+            f.seek(self.offset)
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while self.offset < size:
+                data = f.read(min(chunk_size, size - self.offset))
+                if not data:
+                    break
+                self.offset += len(data)
+                yield decoder.decode(data)
+            yield decoder.decode(b"", final=True)
+            self.consumed_digest = self._consumed_digest(f, self.offset)
+
+    def read_new(self) -> str:
+        return clean_html_content("".join(self.iter_new()))
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.chunks: list[str] = []
+
+    def handle_data(self, data: str) -> None:
+        self.chunks.append(data)
 
 
 def extract_text_from_html(html_content: str) -> list[str]:
-    soup = BeautifulSoup(html_content, "html.parser")
-    return [line.strip() for line in soup.get_text().split("\n") if line.strip()]
+    if lxml is not None:
+        text = lxml.html.fromstring(f"<div>{html_content}</div>").text_content()
+    else:
+        extractor = _TextExtractor()
+        extractor.feed(html_content)
+        extractor.close()
+        text = "".join(extractor.chunks)
+    return [line.strip() for line in text.split("\n") if line.strip()]
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(text: str) -> datetime:
+    return datetime.strptime(text, "%m/%d/%Y")
+
+
+def _parse_value(text: str) -> int:
+    return int(float("".join(char for char in text if char.isdigit() or char == ".")))
+
+
+class AwardTableParser:
+    """
+    Streaming parser that walks table rows and cells directly.
+
+    Only `tr`, `td`, `th` and `table` tags are tokenized (other markup inside
+    a cell is stripped from its text), which is several times cheaper than
+    a full HTML tokenizer. Feed it the dump in chunks and drain `records`
+    between feeds; only the row being parsed is held in memory. Columns are
+    mapped from the first row whose cells match `HEADER_ALIASES`, otherwise
+    `DEFAULT_COLUMNS` (relative to the cell holding the NOA code) is used.
+    """
+
+    def __init__(self, noa_codes: Iterable[str] = NOA_CODES):
+        self.noa_codes = frozenset(noa_codes)
+        self.columns: Optional[dict[str, int]] = None
+        self.records: list[AwardRecord] = []
+        self.skipped = 0
+        self._buffer = ""
+        self._row: Optional[list[str]] = None
+        self._cell: Optional[list[str]] = None
+
+    def restart(self) -> None:
+        """Forgets the header mapping and any partial row (the dump was replaced)."""
+        self.columns = None
+        self.records.clear()
+        self._buffer = ""
+        self._row = self._cell = None
+
+    def feed(self, data: str) -> None:
+        buffer = self._buffer + data
+        position = 0
+        for match in TABLE_TAG_PATTERN.finditer(buffer):
+            if self._cell is not None:
+                self._cell.append(buffer[position : match.start()])
+            position = match.end()
+            closing, tag = match.group(1), match.group(2).lower()
+            if tag in ("td", "th"):
+                self._end_cell()
+                if not closing:
+                    if self._row is None:
+                        self._row = []
+                    self._cell = []
+            else:
+                self._end_row()
+                if tag == "tr" and not closing:
+                    self._row = []
+        # Keep a tag that may be cut off at the chunk boundary for the next feed.
+        tail_start = buffer.rfind("<", position)
+        if tail_start == -1 or ">" in buffer[tail_start:]:
+            tail_start = len(buffer)
+        if self._cell is not None:
+            self._cell.append(buffer[position:tail_start])
+        self._buffer = buffer[tail_start:]
+
+    def close(self) -> None:
+        if self._cell is not None:
+            self._cell.append(self._buffer)
+        self._buffer = ""
+        self._end_row()
+
+    def _end_cell(self) -> None:
+        if self._cell is not None and self._row is not None:
+            text = "".join(self._cell)
+            if "<" in text:
+                text = INNER_TAG_PATTERN.sub("", text)
+            if "&" in text:
+                text = html.unescape(text)
+            self._row.append(" ".join(text.split()))
+        self._cell = None
+
+    def _end_row(self) -> None:
+        self._end_cell()
+        row, self._row = self._row, None
+        if row:
+            self._handle_row(row)
+
+    def _handle_row(self, row: list[str]) -> None:
+        if self.columns is None:
+            header: dict[str, int] = {}
+            for idx, cell in enumerate(row):
+                if field := HEADER_ALIASES.get(cell.lower()):
+                    header.setdefault(field, idx)
+            if len(header) == len(DEFAULT_COLUMNS):
+                self.columns = header
+                return
+        if self.columns is not None:
+            noa_idx, date_idx, value_idx = (
+                self.columns["noa"], self.columns["date"], self.columns["value"]
+            )
+        else:
+            noa_idx = next(
+                (idx for idx, cell in enumerate(row) if cell[:3] in self.noa_codes), None
+            )
+            if noa_idx is None:
+                return
+            date_idx = noa_idx + DEFAULT_COLUMNS["date"]
+            value_idx = noa_idx + DEFAULT_COLUMNS["value"]
+        if max(noa_idx, date_idx, value_idx) >= len(row):
+            return
+        noa_cell = row[noa_idx]
+        if noa_cell[:3] not in self.noa_codes:
+            return
+        try:
+            self.records.append(
+                AwardRecord(
+                    int(noa_cell[:3]),
+                    _parse_date(row[date_idx]),
+                    _parse_value(row[value_idx]),
+                )
+            )
+        except ValueError:
+            self.skipped += 1
+
+
+def iter_award_records(
+    chunks: Iterable[str], parser: Optional[AwardTableParser] = None
+) -> Iterator[AwardRecord]:
+    """Parses HTML chunks as they arrive, yielding records row by row."""
+    parser = parser or AwardTableParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from parser.records
+        parser.records.clear()
+
+
+def parse_award_file(
+    file_path: Path | str, noa_codes: Iterable[str] = NOA_CODES, chunk_size: int = READ_CHUNK_SIZE
+) -> list[AwardRecord]:
+    """Parses a whole dump file in bounded memory."""
+    parser = AwardTableParser(noa_codes)
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        records = list(iter_award_records(iter(lambda: f.read(chunk_size), ""), parser))
+    parser.close()
+    return records + parser.records
 
 
 def parse_award_items(cleaned_content: list[str]):
@@ -32,7 +307,7 @@ def parse_award_items(cleaned_content: list[str]):
     for i, line in enumerate(cleaned_content):
         if i + 5 >= len(cleaned_content):
             continue
-        if any(line.startswith(code) for code in []):
+        if line[:3] in NOA_CODES:
             noa_code: int = int(cleaned_content[i][:3])
             award_date: datetime = datetime.strptime(cleaned_content[i + 1], "%m/%d/%Y")
             award_value: int = int(
@@ -48,51 +323,237 @@ def parse_award_items(cleaned_content: list[str]):
     return award_items
 
 
-def is_within_one_year(award_date: datetime) -> bool:
-    today: datetime = datetime.now()
-    one_year_ago: datetime = today - timedelta(days=365)
+def is_within_one_year(award_date: datetime, now: Optional[datetime] = None) -> bool:
+    today: datetime = now or datetime.now()
+    one_year_ago: datetime = today - AWARD_WINDOW
     return one_year_ago <= award_date <= today
 
 
-def filter_by_date(extracted_info: list[tuple]) -> list[tuple]:
+def filter_by_date(extracted_info: list[tuple], now: Optional[datetime] = None) -> list[tuple]:
+    today: datetime = now or datetime.now()
+    one_year_ago: datetime = today - AWARD_WINDOW
     date_filtered_items: list[tuple] = [
-        extracted for extracted in extracted_info if is_within_one_year(extracted[1])
+        extracted for extracted in extracted_info if one_year_ago <= extracted[1] <= today
     ]
     return date_filtered_items
 
 
+def _format_amount(noa_code: int, amount: int) -> str:
+    return f"${amount}" if noa_code in (000, 000) else f"{amount} hrs."
+
+
 def format_award_items(date_filtered_items: list[tuple]) -> str:
-    code_map: dict[int, str] = {
-        000: {"category": "000"},
-    }
-    header: str = f'[Count: {len(date_filtered_items)}] ...\n'
-    string: str = ""
-    for item in date_filtered_items:
-        noa_code, item_date, amount = item
-        category: str = code_map[noa_code]["category"]
-        amount: str = f"${amount}" if noa_code in (000, 000) else f"{amount} hrs."
-        string += f">>> {item_date.date()}, NOA {noa_code}, {category}, {amount}\n"
-    return '"' + (header + string).strip() + '"'
-
-
-def save_to_file(string: str) -> None:
-    with open("file.txt", "w") as file:
-        file.write(string)
+    lines: list[str] = [f"[Count: {len(date_filtered_items)}] ..."]
+    lines.extend(
+        f">>> {item_date.date()}, NOA {noa_code}, "
+        f"{NOA_CATEGORIES[noa_code]['category']}, {_format_amount(noa_code, amount)}"
+        for noa_code, item_date, amount in date_filtered_items
+    )
+    return '"' + "\n".join(lines).strip() + '"'
+
+
+class AwardStore:
+    """
+    Persistent, date-ordered award records with a rolling one-year window.
+
+    Records live in a WITHOUT ROWID SQLite table whose primary key starts
+    with the award date, so window queries are range scans on the key.
+    Per-NOA counts and totals for the current window are kept in memory and
+    updated incrementally: inserts inside the window are added directly,
+    and moving the window only reads the rows that left or entered it.
+
+    Identical (code, date, value) records are stored once per occurrence in
+    the source dump. The occurrence counter carries across the batches read
+    from one dump, so identical awards appended at different times are all
+    kept; it restarts with `new_source` when the dump is replaced, so
+    re-ingesting a dump that was pasted again does not double count.
+    """
+
+    def __init__(self, db_path: Path | str = AWARD_STORE_PATH):
+        # Used from the watcher's worker thread; calls are never concurrent.
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS awards ("
+            "award_date TEXT, noa_code INTEGER, award_value INTEGER, occurrence INTEGER, "
+            "PRIMARY KEY (award_date, noa_code, award_value, occurrence)) WITHOUT ROWID"
+        )
+        self._bounds: Optional[tuple[str, str]] = None
+        self._totals: dict[int, list[int]] = {}
+        self._occurrences: dict[tuple, int] = {}
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM awards").fetchone()[0]
+
+    @staticmethod
+    def _window_bounds(now: Optional[datetime]) -> tuple[str, str]:
+        today = now or datetime.now()
+        return (today - AWARD_WINDOW).isoformat(" "), today.isoformat(" ")
+
+    def new_source(self) -> None:
+        """The dump was replaced; its records are counted from the start again."""
+        self._occurrences = {}
+
+    def add(self, records: Iterable[tuple]) -> int:
+        """Inserts records read from the current dump, returning how many were new."""
+        occurrences = self._occurrences
+        rows = []
+        for noa_code, award_date, award_value in records:
+            key = (award_date.isoformat(" "), noa_code, award_value)
+            occurrences[key] = occurrences.get(key, -1) + 1
+            rows.append((*key, occurrences[key]))
+        added = 0
+        with self.conn:
+            for row in rows:
+                cursor = self.conn.execute("INSERT OR IGNORE INTO awards VALUES (?, ?, ?, ?)", row)
+                if cursor.rowcount and self._bounds and self._bounds[0] <= row[0] <= self._bounds[1]:
+                    self._apply(row[1], 1, row[2])
+                added += cursor.rowcount
+        return added
+
+    def _apply(self, noa_code: int, count: int, total: int) -> None:
+        aggregate = self._totals.setdefault(noa_code, [0, 0])
+        aggregate[0] += count
+        aggregate[1] += total
+        if not aggregate[0]:
+            del self._totals[noa_code]
+
+    def _grouped(self, clause: str, params: tuple) -> list[tuple[int, int, int]]:
+        return self.conn.execute(
+            "SELECT noa_code, COUNT(*), SUM(award_value) FROM awards "
+            f"WHERE {clause} GROUP BY noa_code",
+            params,
+        ).fetchall()
+
+    def _move_window(self, now: Optional[datetime]) -> tuple[str, str]:
+        start, end = self._window_bounds(now)
+        if self._bounds == (start, end):
+            return start, end
+        if (
+            self._bounds is None
+            or start < self._bounds[0]
+            or end < self._bounds[1]
+            or start > self._bounds[1]
+        ):
+            self._totals = {}
+            for noa_code, count, total in self._grouped("award_date BETWEEN ? AND ?", (start, end)):
+                self._apply(noa_code, count, total)
+        else:
+            old_start, old_end = self._bounds
+            for noa_code, count, total in self._grouped(
+                "award_date >= ? AND award_date < ?", (old_start, start)
+            ):
+                self._apply(noa_code, -count, -total)
+            for noa_code, count, total in self._grouped(
+                "award_date > ? AND award_date <= ?", (old_end, end)
+            ):
+                self._apply(noa_code, count, total)
+        self._bounds = (start, end)
+        return start, end
+
+    def window(self, now: Optional[datetime] = None) -> list[AwardRecord]:
+        """Records from the last year (`now` is read once), oldest first."""
+        start, end = self._window_bounds(now)
+        return [
+            AwardRecord(noa_code, datetime.fromisoformat(award_date), award_value)
+            for award_date, noa_code, award_value in self.conn.execute(
+                "SELECT award_date, noa_code, award_value FROM awards "
+                "WHERE award_date BETWEEN ? AND ? ORDER BY award_date",
+                (start, end),
+            )
+        ]
+
+    def aggregates(self, now: Optional[datetime] = None) -> dict[int, tuple[int, int]]:
+        """{NOA code: (count, total value)} over the last year."""
+        self._move_window(now)
+        return {noa_code: tuple(aggregate) for noa_code, aggregate in sorted(self._totals.items())}
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def render_window_report(store: AwardStore, now: Optional[datetime] = None) -> str:
+    now = now or datetime.now()
+    lines = [format_award_items(store.window(now))]
+    lines.extend(
+        f"NOA {noa_code}, {NOA_CATEGORIES[noa_code]['category']}: "
+        f"{count} award(s), {_format_amount(noa_code, total)}"
+        for noa_code, (count, total) in store.aggregates(now).items()
+    )
+    return "\n".join(lines)
+
+
+def write_window_report(store: AwardStore, report_path: Path = WINDOW_REPORT_PATH) -> None:
+    """Overwrites `report_path` with the current one-year report."""
+    temp_path = report_path.with_name(f"{report_path.name}.tmp")
+    temp_path.write_text(render_window_report(store) + "\n")
+    os.replace(temp_path, report_path)
+
+
+def append_to_file(string: str, output_path: Path = OUTPUT_PATH) -> None:
+    with open(output_path, "a") as file:
+        file.write(string + "\n")
         print(string)
-        print(f"{datetime.now().replace(microsecond=0)}...saved to file.\n")
-
-
-def fetch_and_log_daily_awards():
-    while True:
-        print(datetime.now().replace(microsecond=0))
-        raw_html_content = get_html_content()
-        if raw_html_content:
-            plain_text_award_data = extract_text_from_html(raw_html_content)
-            award_details = parse_award_items(plain_text_award_data)
-            if not award_details:
-                print("[count: 0]")
-                continue
-            recent_award_items = filter_by_date(award_details)
-            formatted_items_string = format_award_items(recent_award_items)
-            save_to_file(formatted_items_string)
-        sleep(2)
+        print(f"{datetime.now().replace(microsecond=0)}...appended to {output_path}.\n")
+
+
+def ingest_new_awards(
+    reader: HtmlDumpReader,
+    parser: AwardTableParser,
+    output_path: Path = OUTPUT_PATH,
+    store: Optional[AwardStore] = None,
+    report_path: Path = WINDOW_REPORT_PATH,
+) -> int:
+    """
+    Parses what was added to the dump since the last call, appends the new
+    items from the last year to `output_path` and returns how many were
+    appended. The parser keeps its state between calls, so a row split
+    across two writes is still parsed once. With a store, the records are
+    also saved and `report_path` is rewritten with the whole one-year
+    window and its per-NOA totals.
+    """
+    chunks = reader.iter_new()
+    first = next(chunks, None)
+    if first is None:
+        return 0
+    if reader.restarted:
+        parser.restart()
+        if store is not None:
+            store.new_source()
+    award_details = list(iter_award_records(chain([first], chunks), parser))
+    if not award_details:
+        print(f"{datetime.now().replace(microsecond=0)} [count: 0]")
+        return 0
+    if store is not None:
+        store.add(award_details)
+        write_window_report(store, report_path)
+    recent_award_items = filter_by_date(award_details)
+    append_to_file(format_award_items(recent_award_items), output_path)
+    return len(recent_award_items)
+
+
+def fetch_and_log_daily_awards(
+    dump_path: Path = HTML_DUMP_PATH,
+    output_path: Path = OUTPUT_PATH,
+    debounce: float = 0.5,
+    store_path: Optional[Path] = AWARD_STORE_PATH,
+    report_path: Path = WINDOW_REPORT_PATH,
+):
+    """
+    Waits for changes to the dump file (inotify, or polling where that is
+    unavailable) and ingests each settled change once; idle waits block in
+    the watcher instead of re-reading the file every two seconds.
+    """
+    dump_path = Path(dump_path).resolve()
+    reader, parser = HtmlDumpReader(dump_path), AwardTableParser()
+    store = AwardStore(store_path) if store_path else None
+    try:
+        DirectoryWatcher(
+            [dump_path.parent],
+            lambda _: ingest_new_awards(reader, parser, output_path, store, report_path),
+            file_filter=lambda path: path == dump_path,
+            debounce=debounce,
+            poll_interval=5.0,
+        ).run()
+    finally:
+        if store is not None:
+            store.close()
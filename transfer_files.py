@@ -1,15 +1,168 @@
+import hashlib
+import json
+import os
 import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from time import sleep
-from typing import Optional
+from statistics import median
+from time import perf_counter, sleep
+from typing import Callable, Optional
 
-from rich.console import Console
+from dir_watcher import DirectoryWatcher
+from rich.progress import BarColumn, DownloadColumn, Progress, TransferSpeedColumn
 from rich.traceback import install
 
 install(show_locals=True)
 
+CHUNK_SIZE: int = 8 * 1024 * 1024
+MAX_RETRIES: int = 4
+RETRY_BACKOFF: float = 0.5
+JOURNAL_PATH: Path = Path("transfer_journal.jsonl")
+MANIFEST_PATH: Path = Path("transfer_manifest.json")
+
+
+@dataclass
+class TransferResult:
+    file_path: Path
+    status: str
+    bytes_copied: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class TransferJournal:
+    """
+    Append-only record of completed copies for the current run.
+
+    Entries are keyed by source path, size, mtime and target, so a resumed
+    run skips files that finished before the interruption but still copies
+    any that changed since. The journal is removed once a run completes
+    without failures.
+    """
+
+    def __init__(self, path: Path = JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: set[str] = set()
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                self._done = {json.loads(line)["key"] for line in f if line.strip()}
+
+    @staticmethod
+    def key(file_transfer: "FileTransfer") -> str:
+        stat = file_transfer.file_path.stat()
+        return f"{file_transfer.file_path}|{stat.st_size}|{stat.st_mtime_ns}|{file_transfer.target_dir}"
+
+    def is_done(self, key: str) -> bool:
+        return key in self._done
+
+    def mark_done(self, key: str) -> None:
+        with self._lock:
+            self._done.add(key)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "time": datetime.now().isoformat()}) + "\n")
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self._done.clear()
+
+
+def fast_hash(file_path: Path) -> str:
+    digest = hashlib.blake2b()
+    with file_path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TransferManifest:
+    """
+    Persistent size/mtime/hash record per source -> target pair.
+
+    A file is copied only when its size or mtime differs from the last
+    recorded copy (or the target is missing). With `use_hash`, a file whose
+    mtime changed but whose content hash did not is not recopied, and
+    `verify_targets` can check the copies against the recorded hashes.
+
+    Entries are saved as they are recorded (at most every SAVE_INTERVAL
+    seconds, and always by `save`), so a crash loses at most the last few.
+    """
+
+    SAVE_INTERVAL: float = 1.0
+
+    def __init__(self, path: Path = MANIFEST_PATH, use_hash: bool = False):
+        self.path = path
+        self.use_hash = use_hash
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(file_transfer: "FileTransfer") -> str:
+        return f"{file_transfer.file_path}|{file_transfer.target_dir}"
+
+    def needs_copy(self, file_transfer: "FileTransfer") -> bool:
+        target_path = file_transfer.target_dir / file_transfer.file_path.name
+        entry = self.entries.get(self.key(file_transfer))
+        if entry is None or not target_path.exists():
+            return True
+        stat = file_transfer.file_path.stat()
+        if stat.st_size != entry["size"]:
+            return True
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return False
+        if self.use_hash and entry.get("hash") == fast_hash(file_transfer.file_path):
+            self.record(file_transfer, stat, entry["hash"])  # touched, not changed
+            return False
+        return True
+
+    def record(
+        self, file_transfer: "FileTransfer", stat: os.stat_result, digest: Optional[str] = None
+    ) -> None:
+        """
+        Records a copy. `stat` must be taken before the copy started, so a
+        source modified during the copy is seen as changed next time.
+        """
+        with self._lock:
+            self.entries[self.key(file_transfer)] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": digest,
+                "target": str(file_transfer.target_dir / file_transfer.file_path.name),
+                "copied": datetime.now().replace(microsecond=0).isoformat(),
+            }
+            if perf_counter() - self._last_save >= self.SAVE_INTERVAL:
+                self._save()
+
+    def _save(self) -> None:
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self._last_save = perf_counter()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def verify_targets(self) -> list[str]:
+        """Returns the targets whose content no longer matches the recorded hash."""
+        mismatched = []
+        for entry in self.entries.values():
+            target_path = Path(entry["target"])
+            if entry.get("hash") is None:
+                continue
+            if not target_path.exists() or fast_hash(target_path) != entry["hash"]:
+                mismatched.append(str(target_path))
+        return mismatched
+
 
 @dataclass
 class FileTransfer:
@@ -66,13 +219,52 @@ class FileTransfer:
         print("- Transfer not required.")
         return False
 
-    def _copy_file(self) -> None:
+    def _copy_file(
+        self,
+        progress: Optional[Callable[[int], None]] = None,
+        hasher: Optional[Callable] = None,
+    ) -> tuple[int, Optional[str]]:
         """
-        Copies the file to the target directory.
+        Copies the file to the target directory in chunks, retrying transient
+        errors with exponential backoff. Data is written to a uniquely named
+        '.partial' file in the target directory and renamed into place, so an
+        interrupted copy never looks complete and concurrent jobs with the
+        same target name never share a temp file.
+        Returns the number of bytes copied and, if a hasher factory is given,
+        the hex digest of the copied content.
         """
         target_path = self.target_dir / self.file_path.name
-        shutil.copy2(self.file_path, target_path)
-        print("- File transfer complete.")
+        fd, partial_name = tempfile.mkstemp(
+            dir=self.target_dir, prefix=f"{target_path.name}.", suffix=".partial"
+        )
+        os.close(fd)
+        partial_path = Path(partial_name)
+        for attempt in range(1, MAX_RETRIES + 1):
+            copied = 0
+            digest = hasher() if hasher else None
+            try:
+                with self.file_path.open("rb") as src, partial_path.open("wb") as dst:
+                    while chunk := src.read(CHUNK_SIZE):
+                        dst.write(chunk)
+                        copied += len(chunk)
+                        if digest:
+                            digest.update(chunk)
+                        if progress:
+                            progress(len(chunk))
+                shutil.copystat(self.file_path, partial_path)
+                os.replace(partial_path, target_path)
+                print(f"- File transfer complete: {self.file_path.name}")
+                return copied, digest.hexdigest() if digest else None
+            except OSError as e:
+                if progress and copied:
+                    progress(-copied)
+                if attempt == MAX_RETRIES:
+                    partial_path.unlink(missing_ok=True)
+                    raise
+                delay = RETRY_BACKOFF * 2 ** (attempt - 1)
+                print(f"- {self.file_path.name}: {e}  |  retry {attempt}/{MAX_RETRIES - 1} in {delay:.1f} sec.")
+                sleep(delay)
+        return 0, None
 
     def _remove_file(self) -> None:
         """
@@ -81,12 +273,20 @@ class FileTransfer:
         self.file_path.unlink()
         print(f"- File successfully deleted.")
 
-    def process_file(self) -> None:
+    def process_file(
+        self,
+        journal: Optional[TransferJournal] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        manifest: Optional[TransferManifest] = None,
+        copy_required: Optional[bool] = None,
+    ) -> TransferResult:
         """
         Processes the file by validating, transferring, and deleting (if required).
+        `copy_required` is the manifest decision when the caller already made it.
         """
         print(self)
-        sleep(1)
+        timer_start = perf_counter()
+        result = TransferResult(file_path=self.file_path, status="skipped")
         try:
             if not (self.target_dir.exists() and self.target_dir.is_dir()):
                 raise ValueError(
@@ -94,19 +294,52 @@ class FileTransfer:
                 )
             elif not (self.file_path.exists() and self.file_path.is_file()):
                 raise ValueError(f"File not found or not a file: {self.file_path}")
-        
+
+            journal_key = journal.key(self) if journal else None
+            already_copied = journal is not None and journal.is_done(journal_key)
+
             if self.category == "award":
                 self._get_last_modified()
-                self._copy_file()
+                if not already_copied:
+                    result.bytes_copied, _ = self._copy_file(progress)
+                    if journal:
+                        journal.mark_done(journal_key)
                 self._remove_file()
+                result.status = "moved"
+
+            elif already_copied:
+                print(f"- Already transferred in interrupted run: {self.file_path.name}")
+                result.status = "resumed"
+
+            elif manifest is not None:
+                if manifest.needs_copy(self) if copy_required is None else copy_required:
+                    hasher = hashlib.blake2b if manifest.use_hash else None
+                    stat = self.file_path.stat()
+                    result.bytes_copied, digest = self._copy_file(progress, hasher)
+                    current = self.file_path.stat()
+                    if (current.st_size, current.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                        manifest.record(self, stat, digest)
+                    else:
+                        print(f"- Modified during copy, will be copied again: {self.file_path.name}")
+                    if journal:
+                        journal.mark_done(journal_key)
+                    result.status = "copied"
+                else:
+                    print(f"- Unchanged since last sync: {self.file_path.name}")
 
-            elif self._is_recent(): self._copy_file()
+            elif self._is_recent():
+                result.bytes_copied, _ = self._copy_file(progress)
+                if journal:
+                    journal.mark_done(journal_key)
+                result.status = "copied"
             # else: self.copy_file()
-            
 
         except Exception as e:
-            print(f"- ERROR: {e}")
-        print()
+            print(f"- ERROR: {self.file_path.name}: {e}")
+            result.status = "failed"
+            result.error = str(e)
+        result.elapsed = perf_counter() - timer_start
+        return result
 
 
 def get_award_files() -> Optional[list[FileTransfer]]:
@@ -126,32 +359,172 @@ def get_award_files() -> Optional[list[FileTransfer]]:
     return award_files
 
 
-def process_transfers():
+def _copy_required(
+    file_transfer: FileTransfer,
+    journal: TransferJournal,
+    manifest: Optional[TransferManifest],
+) -> Optional[bool]:
     """
-    * Prepare file transfers by converting file paths and directories to FileTransfer object.
-    * Process file transfers
+    Whether `process_file` will copy the file (None when it will fail
+    validation), decided the same way without printing.
+    """
+    try:
+        if not (file_transfer.file_path.is_file() and file_transfer.target_dir.is_dir()):
+            return None
+        if journal.is_done(journal.key(file_transfer)):
+            return False
+        if file_transfer.category == "award":
+            return True
+        if manifest is not None:
+            return manifest.needs_copy(file_transfer)
+        modified = datetime.fromtimestamp(file_transfer.file_path.stat().st_mtime)
+        return datetime.now() - timedelta(hours=24) <= modified.replace(second=0, microsecond=0)
+    except OSError:
+        return None
+
+
+def run_transfers(
+    file_transfers: list[FileTransfer],
+    max_workers: int = 4,
+    journal: Optional[TransferJournal] = None,
+    manifest: Optional[TransferManifest] = None,
+    verify: bool = False,
+) -> list[TransferResult]:
+    """
+    Runs the transfers on a bounded thread pool with a byte-level progress bar.
+    With a manifest, only files changed since the last recorded copy are
+    transferred (instead of everything modified in the last 24 hours), and
+    `verify` re-hashes the recorded targets afterwards (needs `use_hash`).
     """
-    with Console().status(
-        "[bright_yellow]Processing file transfers...[/bright_yellow]"
-    ):
-        parent_dir: Path
-        base_transfers: tuple[tuple[Path, Path]]
-        
-        file_transfers: list[FileTransfer] = []
-        
-        for tranfser_pairs in base_transfers:
-            for file_path, target_dir in tranfser_pairs:
-                file_transfers.append(
-                    FileTransfer(file_path=file_path, target_dir=target_dir)
+    journal = journal if journal is not None else TransferJournal()
+    copy_required = [_copy_required(ft, journal, manifest) for ft in file_transfers]
+    # Only files that will actually be copied count towards the progress total.
+    total_bytes = sum(
+        ft.file_path.stat().st_size
+        for ft, required in zip(file_transfers, copy_required)
+        if required
+    )
+    timer_start = perf_counter()
+    with Progress(
+        "[bright_yellow]Processing file transfers...",
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+    ) as progress_bar:
+        task = progress_bar.add_task("transfer", total=total_bytes)
+
+        def advance(n_bytes: int) -> None:
+            progress_bar.advance(task, n_bytes)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda ft, required: ft.process_file(
+                        journal, advance, manifest, required if manifest is not None else None
+                    ),
+                    file_transfers,
+                    copy_required,
                 )
-        if local_award_files := get_award_files():
-            file_transfers.extend(local_award_files)
+            )
+    elapsed = perf_counter() - timer_start
+    if manifest is not None:
+        manifest.save()
+
+    if not any(result.status == "failed" for result in results):
+        journal.clear()
+    print_transfer_report(results, elapsed)
+    if verify and manifest is not None:
+        mismatched = manifest.verify_targets()
+        print(f"Verified targets against the manifest: {len(mismatched)} mismatched.")
+        for target in mismatched:
+            print(f"- MISMATCH: {target}")
+    return results
+
+
+def print_transfer_report(results: list[TransferResult], elapsed: float) -> None:
+    copied_bytes = sum(result.bytes_copied for result in results)
+    statuses: dict[str, int] = {}
+    for result in results:
+        statuses[result.status] = statuses.get(result.status, 0) + 1
+    latencies = [result.elapsed for result in results if result.bytes_copied]
+    throughput = copied_bytes / elapsed / 1024**2 if elapsed else 0.0
+
+    print(f"\n{len(results)} files in {elapsed:.2f} sec.  |  " + ", ".join(
+        f"{status}: {count}" for status, count in sorted(statuses.items())
+    ))
+    print(f"{copied_bytes / 1024**2:.2f} MB copied  |  {throughput:.2f} MB/s")
+    if latencies:
+        print(
+            f"per-file latency  |  min {min(latencies):.3f} sec.  |  "
+            f"median {median(latencies):.3f} sec.  |  max {max(latencies):.3f} sec."
+        )
+    for result in results:
+        if result.error:
+            print(f"- FAILED: {result.file_path}: {result.error}")
 
-        for file_transfer in file_transfers:
-            file_transfer.process_file()
+
+def process_transfers(
+    max_workers: int = 4, use_manifest: bool = True, use_hash: bool = False, verify: bool = False
+):
+    """
+    * Prepare file transfers by converting file paths and directories to FileTransfer object.
+    * Process file transfers (manifest-based change detection unless `use_manifest` is False)
+    * With `verify` (and `use_hash`), check every recorded target against its hash
+    """
+    parent_dir: Path
+    base_transfers: tuple[tuple[Path, Path]]
+
+    file_transfers: list[FileTransfer] = []
+
+    for tranfser_pairs in base_transfers:
+        for file_path, target_dir in tranfser_pairs:
+            file_transfers.append(
+                FileTransfer(file_path=file_path, target_dir=target_dir)
+            )
+    if local_award_files := get_award_files():
+        file_transfers.extend(local_award_files)
+
+    manifest = TransferManifest(use_hash=use_hash) if use_manifest else None
+    run_transfers(file_transfers, max_workers=max_workers, manifest=manifest, verify=verify)
 
     print("\nProcessing complete.\n")
 
 
+def watch_transfers(max_workers: int = 2, debounce: float = 2.0, use_hash: bool = False):
+    """
+    Long-running alternative to `process_transfers`: watches the source
+    directories and transfers each file as soon as it has settled, instead
+    of rescanning everything on a schedule.
+    """
+    base_transfers: tuple[tuple[Path, Path]]
+    network_dir: Path
+    local_dir: Path
+
+    targets: dict[Path, Path] = {
+        Path(file_path): Path(target_dir)
+        for tranfser_pairs in base_transfers
+        for file_path, target_dir in tranfser_pairs
+    }
+    local_dir = Path(local_dir)
+    manifest = TransferManifest(use_hash=use_hash)
+
+    def is_tracked(path: Path) -> bool:
+        return path in targets or path.parent == local_dir
+
+    def transfer(path: Path) -> None:
+        if path.parent == local_dir:
+            file_transfer = FileTransfer(file_path=path, target_dir=network_dir, category="award")
+        else:
+            file_transfer = FileTransfer(file_path=path, target_dir=targets[path])
+        result = file_transfer.process_file(manifest=manifest)
+        if result.status == "copied":
+            manifest.save()
+
+    directories = [local_dir, *(path.parent for path in targets)]
+    DirectoryWatcher(
+        directories, transfer, file_filter=is_tracked, debounce=debounce, workers=max_workers
+    ).run()
+
+
 # if __name__ == "__main__":
 #     process_transfers()